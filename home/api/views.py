@@ -1,5 +1,6 @@
-from django.shortcuts import render
+from home.pages import HOME_TEMPLATE, page_response
 
 # Create your views here.
 def home(request):
-    return render(request, "home/home.html")
+    # static page: served from home.pages instead of rendering per request
+    return page_response(request, HOME_TEMPLATE)
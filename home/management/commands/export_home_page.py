@@ -0,0 +1,33 @@
+import os
+
+from django.core.management import BaseCommand
+
+from home.pages import HOME_TEMPLATE, render_page
+
+
+SUFFIXES = {"identity": "", "gzip": ".gz", "br": ".br"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the rendered public home page and its precompressed variants "
+        "(index.html, index.html.gz, index.html.br) for a web server to serve directly"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Directory to write the files to")
+        parser.add_argument("--template", default=HOME_TEMPLATE, help="Template to export")
+        parser.add_argument("--name", default="index.html", help="Base file name")
+
+    def handle(self, *args, **options):
+        page = render_page(options["template"])
+        os.makedirs(options["output"], exist_ok=True)
+        for encoding, body in page.variants.items():
+            path = os.path.join(options["output"], options["name"] + SUFFIXES[encoding])
+            with open(path, "wb") as f:
+                f.write(body)
+            if page.mtime is not None:
+                # keep gzip_static / If-Modified-Since in step with the template
+                os.utime(path, (page.mtime, page.mtime))
+            self.stdout.write(f"{path} ({len(body)} bytes)")
+        self.stdout.write(self.style.SUCCESS(f"Exported {options['template']} (etag {page.etag})"))
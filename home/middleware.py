@@ -0,0 +1,87 @@
+# home/middleware.py
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import DisallowedHost
+from django.db import connection
+from django.urls import reverse
+from django_tenants.middleware.main import TenantMainMiddleware
+from django_tenants.utils import get_public_schema_name, get_tenant_domain_model
+
+from home.pages import HOME_TEMPLATE, page_response
+from tenant.resolver import resolve_hostname
+
+
+class CachedHomePageMiddleware:
+    """
+    Serves the public home page to anonymous visitors before the session,
+    auth and tenant middleware run.
+
+    Must come right after SecurityMiddleware, which still adds HSTS,
+    Referrer-Policy, COOP and nosniff to the cached page. A request qualifies
+    when it is a GET/HEAD of the public home url on a public-schema hostname
+    without a session cookie; everything else goes through the normal stack. The hostname lookup is the
+    cached one of CachedTenantMiddleware, so a hit costs no queries.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self._home_path = None
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if self.may_be_home(request):
+            response = self.serve(request)
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if self.may_be_home(request):
+            # the hostname lookup may query the database
+            response = await sync_to_async(self.serve)(request)
+            if response is not None:
+                return response
+        return await self.get_response(request)
+
+    def serve(self, request):
+        """The cached home page, or None when the hostname is not public."""
+        if not self.is_public_host(request):
+            return None
+        response = page_response(request, HOME_TEMPLATE)
+        # XFrameOptionsMiddleware comes later in the stack, add its header here
+        response.setdefault("X-Frame-Options", getattr(settings, "X_FRAME_OPTIONS", "DENY"))
+        return response
+
+    @property
+    def home_path(self):
+        if self._home_path is None:
+            self._home_path = reverse("home-page", urlconf=settings.PUBLIC_SCHEMA_URLCONF)
+        return self._home_path
+
+    def may_be_home(self, request):
+        # cheap checks first, no hostname lookup for most requests
+        if request.method not in ("GET", "HEAD") or request.path_info != self.home_path:
+            return False
+        return settings.SESSION_COOKIE_NAME not in request.COOKIES
+
+    def is_public_host(self, request):
+        try:
+            hostname = TenantMainMiddleware.hostname_from_request(request)
+        except DisallowedHost:
+            return False
+
+        # tenant metadata lives in public, the connection may still be on the
+        # previous request's schema
+        connection.set_schema_to_public()
+        domain_model = get_tenant_domain_model()
+        try:
+            tenant = resolve_hostname(hostname, domain_model)
+        except domain_model.DoesNotExist:
+            return False
+        return tenant.schema_name == get_public_schema_name()
@@ -0,0 +1,108 @@
+# home/pages.py
+import gzip
+import hashlib
+import os
+import threading
+from collections import namedtuple
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.template.loader import get_template
+from django.utils.http import http_date, parse_etags
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only without it
+    brotli = None
+
+
+HOME_TEMPLATE = "home/home.html"
+
+
+'''
+    mentality: the public home page is static html, render it once per
+    template version instead of once per request.
+    - a rendered page is cached per process, keyed by template name and the
+      template file mtime; editing the file re-renders it on the next hit.
+    - gzip (and brotli when the package is installed) bodies are built when
+      the page is rendered, requests only pick one by Accept-Encoding.
+    - pages are rendered without a request: no csrf token, user or messages,
+      so only templates that don't use the request context belong here.
+'''
+RenderedPage = namedtuple("RenderedPage", ["path", "mtime", "etag", "variants"])
+
+_pages = {}
+_lock = threading.Lock()
+
+
+def render_page(template_name):
+    """Return the RenderedPage for ``template_name``, re-rendered if the file changed."""
+    page = _pages.get(template_name)
+    if page is not None and _mtime(page.path) == page.mtime:
+        return page
+
+    with _lock:
+        template = get_template(template_name)
+        path = template.origin.name
+        mtime = _mtime(path)
+        body = template.render().encode(settings.DEFAULT_CHARSET)
+        variants = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants["br"] = brotli.compress(body, mode=brotli.MODE_TEXT)
+        page = RenderedPage(
+            path=path,
+            mtime=mtime,
+            etag='"%s"' % hashlib.md5(body).hexdigest(),
+            variants=variants,
+        )
+        _pages[template_name] = page
+    return page
+
+
+def page_response(request, template_name):
+    """Serve the cached ``template_name``, compressed when the client accepts it."""
+    page = render_page(template_name)
+    if page.etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+    else:
+        encoding = choose_encoding(request.headers.get("Accept-Encoding", ""), page.variants)
+        response = HttpResponse(
+            page.variants[encoding],
+            content_type=f"text/html; charset={settings.DEFAULT_CHARSET}",
+        )
+        if encoding != "identity":
+            response["Content-Encoding"] = encoding
+        response["Content-Length"] = len(response.content)
+
+    response["ETag"] = page.etag
+    if page.mtime is not None:
+        response["Last-Modified"] = http_date(page.mtime)
+    response["Vary"] = "Accept-Encoding"
+    response["Cache-Control"] = "public, max-age=%d" % getattr(settings, "HOME_PAGE_MAX_AGE", 300)
+    return response
+
+
+def choose_encoding(accept_encoding, variants):
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        quality = params.strip().lower()
+        if quality.startswith("q=") and quality[2:].strip("0.") == "":
+            continue  # q=0 / q=0.0: explicitly refused
+        accepted.add(coding.strip().lower())
+    for encoding in ("br", "gzip"):
+        if encoding in variants and encoding in accepted:
+            return encoding
+    return "identity"
+
+
+def clear_pages():
+    with _lock:
+        _pages.clear()
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except (OSError, TypeError):
+        return None
@@ -0,0 +1,58 @@
+from unittest import mock
+
+from django.http import HttpResponse
+from django.middleware.security import SecurityMiddleware
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from .middleware import CachedHomePageMiddleware
+from .pages import choose_encoding
+
+
+class ChooseEncodingTests(SimpleTestCase):
+    variants = {"br", "gzip"}
+
+    def test_prefers_brotli(self):
+        self.assertEqual(choose_encoding("gzip, deflate, br", self.variants), "br")
+
+    def test_falls_back_to_gzip(self):
+        self.assertEqual(choose_encoding("gzip", self.variants), "gzip")
+        self.assertEqual(choose_encoding("br, gzip", {"gzip"}), "gzip")
+
+    def test_identity(self):
+        self.assertEqual(choose_encoding("", self.variants), "identity")
+        self.assertEqual(choose_encoding("deflate", self.variants), "identity")
+
+    def test_zero_quality_is_refused(self):
+        for header in ("br;q=0, gzip", "br; q=0.0, gzip", "br;q=0.000,gzip;q=0.5"):
+            with self.subTest(header=header):
+                self.assertEqual(choose_encoding(header, self.variants), "gzip")
+        self.assertEqual(choose_encoding("br;q=0, gzip;q=0", self.variants), "identity")
+
+    def test_non_zero_quality_is_accepted(self):
+        self.assertEqual(choose_encoding("br;q=0.1", self.variants), "br")
+        self.assertEqual(choose_encoding("GZIP;Q=1", self.variants), "gzip")
+
+
+@override_settings(SECURE_HSTS_SECONDS=3600, ALLOWED_HOSTS=["*"])
+class CachedHomePageTests(SimpleTestCase):
+    def stack(self):
+        # same order as MIDDLEWARE
+        home = CachedHomePageMiddleware(lambda request: HttpResponse("from the view"))
+        return SecurityMiddleware(home), home
+
+    def test_cached_page_gets_security_headers(self):
+        stack, home = self.stack()
+        with mock.patch.object(home, "is_public_host", return_value=True):
+            response = stack(RequestFactory().get(home.home_path, secure=True))
+        self.assertNotEqual(response.content, b"from the view")
+        self.assertEqual(response["Strict-Transport-Security"], "max-age=3600")
+        self.assertEqual(response["X-Content-Type-Options"], "nosniff")
+        self.assertIn("Referrer-Policy", response)
+        self.assertIn("Cross-Origin-Opener-Policy", response)
+        self.assertEqual(response["X-Frame-Options"], "DENY")
+
+    def test_session_cookie_skips_the_cache(self):
+        stack, home = self.stack()
+        request = RequestFactory().get(home.home_path)
+        request.COOKIES["sessionid"] = "x"
+        self.assertEqual(stack(request).content, b"from the view")
@@ -1,9 +1,10 @@
 from django.contrib import admin
+from tenant.admin_mixins import EstimatedCountAdminMixin
 from .models import SubscriptionPlan
 
 
 @admin.register(SubscriptionPlan)
-class SubscriptionPlanAdmin(admin.ModelAdmin):
+class SubscriptionPlanAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     # -------- List View --------
     list_display = (
         "display_name",
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SubscriptionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'subscriptions'
+
+    def ready(self):
+        from subscriptions import signals  # noqa: F401
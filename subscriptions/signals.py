@@ -0,0 +1,13 @@
+# subscriptions/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from subscriptions.models import SubscriptionPlan
+from subscriptions.utils.entitlements import entitlements
+
+
+@receiver([post_save, post_delete], sender=SubscriptionPlan)
+def reload_entitlements(sender, instance, **kwargs):
+    # every process reloads lazily on its next lookup, once the change is visible
+    transaction.on_commit(entitlements.invalidate)
@@ -0,0 +1,175 @@
+# subscriptions/utils/entitlements.py
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core.cache import cache
+
+from subscriptions.utils.plan import PlanCode
+
+
+'''
+    mentality: plans are "mostly read-only after creation", so quota checks
+    should not query SubscriptionPlan on every request.
+    - load every plan once into an immutable table keyed by PlanCode (and id,
+      since Tenant only carries plan_id).
+    - a change to any plan row swaps in a freshly loaded table.
+    - the table is process-local, so a change also bumps a version kept in
+      the shared Django cache; every process compares it at most once per
+      ENTITLEMENTS_VERSION_CHECK_INTERVAL seconds and reloads when it moved.
+    - retired plans (is_active=False) stay in the table: they can't be
+      assigned to new tenants but existing tenants are still on them.
+'''
+LIMIT_FEATURES = (
+    "max_users",
+    "max_lead_forms",
+    "storage_gb_per_user",
+    "bulk_email_limit",
+)
+FLAG_FEATURES = (
+    "bulk_sms",
+)
+FEATURES = LIMIT_FEATURES + FLAG_FEATURES
+
+VERSION_KEY = "subscriptions:entitlements-version"
+
+
+def shared_version():
+    return cache.get(VERSION_KEY, 0)
+
+
+def bump_shared_version():
+    cache.add(VERSION_KEY, 0, timeout=None)
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # evicted between add() and incr()
+        cache.set(VERSION_KEY, 1, timeout=None)
+
+
+@dataclass(frozen=True)
+class PlanEntitlements:
+    id: int
+    code: PlanCode
+    is_active: bool
+    max_users: int
+    max_lead_forms: int | None          # None = unlimited
+    storage_gb_per_user: int
+    bulk_email_limit: int | None        # None = unlimited
+    bulk_sms: bool
+
+    @classmethod
+    def from_plan(cls, plan):
+        return cls(
+            id=plan.id,
+            code=PlanCode(plan.code),
+            is_active=plan.is_active,
+            max_users=plan.max_users,
+            max_lead_forms=plan.max_lead_forms,
+            storage_gb_per_user=plan.storage_gb_per_user,
+            bulk_email_limit=plan.bulk_email_limit,
+            bulk_sms=plan.bulk_sms,
+        )
+
+
+class EntitlementService:
+    def __init__(self, check_interval=None):
+        self._by_code = None
+        self._by_id = None
+        self._generation = 0
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        if check_interval is None:
+            check_interval = getattr(settings, "ENTITLEMENTS_VERSION_CHECK_INTERVAL", 5)
+        self.check_interval = check_interval
+
+    # -------- loading --------
+    def refresh(self):
+        """Reload every plan; readers keep using the old table until the swap."""
+        from subscriptions.models import SubscriptionPlan
+
+        generation = self._generation
+        # read before loading: a bump during the load triggers another reload
+        version = shared_version()
+        plans = [PlanEntitlements.from_plan(p) for p in SubscriptionPlan.objects.all()]
+        by_id = MappingProxyType({p.id: p for p in plans})
+        by_code = MappingProxyType({p.code: p for p in plans})
+        with self._lock:
+            # a plan changed while we were loading: don't install stale data
+            if generation == self._generation:
+                self._by_id, self._by_code = by_id, by_code
+                self._version = version
+                self._checked_at = time.monotonic()
+        return by_code, by_id
+
+    def invalidate(self):
+        """Drop the table here and tell every other process to reload theirs."""
+        bump_shared_version()
+        self.clear_local()
+
+    def clear_local(self):
+        with self._lock:
+            self._generation += 1
+            self._by_code = None
+            self._by_id = None
+
+    def _check_version(self):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return
+            self._checked_at = now
+            loaded = self._version
+        if shared_version() != loaded:
+            self.clear_local()
+
+    def _tables(self):
+        self._check_version()
+        with self._lock:
+            by_code, by_id = self._by_code, self._by_id
+        if by_code is None or by_id is None:
+            by_code, by_id = self.refresh()
+        return by_code, by_id
+
+    # -------- lookups --------
+    def get(self, code):
+        by_code, _ = self._tables()
+        return by_code.get(PlanCode(code))
+
+    def for_tenant(self, tenant):
+        """Entitlements of the tenant's plan, or None when it has no plan."""
+        if tenant.plan_id is None:
+            return None
+        _, by_id = self._tables()
+        return by_id.get(tenant.plan_id)
+
+    def limit(self, tenant, feature):
+        """Numeric limit for ``feature``; None means unlimited, 0 means no plan."""
+        if feature not in LIMIT_FEATURES:
+            raise ValueError(f"Unknown limit feature: {feature}")
+        plan = self.for_tenant(tenant)
+        if plan is None:
+            return 0
+        return getattr(plan, feature)
+
+    def can(self, tenant, feature):
+        """Is ``feature`` enabled (flags) or allowed at all (limits) for the tenant?"""
+        if feature in FLAG_FEATURES:
+            plan = self.for_tenant(tenant)
+            return plan is not None and getattr(plan, feature)
+        value = self.limit(tenant, feature)
+        return value is None or value > 0
+
+
+entitlements = EntitlementService()
+
+
+def can(tenant, feature):
+    return entitlements.can(tenant, feature)
+
+
+def limit(tenant, feature):
+    return entitlements.limit(tenant, feature)
@@ -1,2 +1,35 @@
 from django.contrib import admin
+
+from tenant.admin_mixins import EstimatedCountAdminMixin
+from tenant.models import Domain, Job, Tenant
 # Register your models here.
+
+
+@admin.register(Tenant)
+class TenantAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    # -------- List View --------
+    list_display = ("name", "slug", "schema_name", "plan", "is_active", "created_at")
+    list_select_related = ("plan",)
+    list_filter = ("is_active",)
+    # prefix match on UPPER(slug), see Tenant.Meta.indexes
+    search_fields = ("^slug",)
+
+
+@admin.register(Domain)
+class DomainAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    # -------- List View --------
+    list_display = ("domain", "tenant", "is_primary", "created_at")
+    list_select_related = ("tenant",)
+    list_filter = ("is_primary",)
+    # prefix match on UPPER(domain), see Domain.Meta.indexes
+    search_fields = ("^domain",)
+    raw_id_fields = ("tenant",)
+
+
+@admin.register(Job)
+class JobAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    # -------- List View --------
+    list_display = ("name", "tenant", "status", "attempts", "run_after", "finished_at")
+    list_select_related = ("tenant",)
+    list_filter = ("status", "name")
+    raw_id_fields = ("tenant",)
@@ -1,3 +1,45 @@
 # views.py
 from django.shortcuts import render
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+
+from tenant.instrumentation import tenant_metrics
+from tenant.reporting import csv_lines, get_report, report_columns, run_report
+from todo.pagination import stream_json_array
+
+
+# Per-tenant request metrics collected by TenantMetricsMiddleware (this process only)
+def metrics(request):
+    if not (request.user.is_authenticated and request.user.is_staff):
+        return JsonResponse({"error": "staff only"}, status=403)
+    if request.method == "POST" and request.POST.get("reset"):
+        tenant_metrics.reset()
+    return JsonResponse({"tenants": tenant_metrics.snapshot()})
+
+
+# Cross-tenant reports (tenant.reporting), streamed as CSV or JSON
+def report(request, name):
+    '''
+        ?format=csv|json   (default json)
+        ?by=tenant|plan    (default tenant)
+        ?active=1          -> only active tenants
+    '''
+    if not (request.user.is_authenticated and request.user.is_staff):
+        return JsonResponse({"error": "staff only"}, status=403)
+    output = request.GET.get("format", "json")
+    by = request.GET.get("by", "tenant")
+    if output not in ("csv", "json"):
+        return JsonResponse({"error": "format must be csv or json"}, status=400)
+    try:
+        selected = get_report(name)
+        rows = run_report(selected, active_only=request.GET.get("active") in ("1", "true"), by=by)
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    if output == "csv":
+        response = StreamingHttpResponse(
+            csv_lines(rows, report_columns(selected, by)),
+            content_type="text/csv",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{name}.csv"'
+        return response
+    return StreamingHttpResponse(stream_json_array(rows, lambda row: row), content_type="application/json")
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TenantConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tenant'
+
+    def ready(self):
+        from tenant import signals  # noqa: F401
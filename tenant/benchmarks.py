@@ -0,0 +1,96 @@
+# tenant/benchmarks.py
+import statistics
+import subprocess
+import time
+
+
+'''
+    mentality: every benchmark reports the same machine-readable shape, so
+    results from different commits can be diffed or plotted.
+'''
+def summarize(samples, elapsed):
+    """Latency stats (ms) and throughput for a list of per-call durations (s)."""
+    ordered = sorted(samples)
+
+    def percentile(q):
+        index = min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "n": len(ordered),
+        "throughput_per_s": round(len(ordered) / elapsed, 2) if elapsed else None,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def measure(func, iterations, warmup=0, before_each=None):
+    """Call ``func(i)`` ``iterations`` times and summarize the durations."""
+    for i in range(warmup):
+        func(i)
+
+    samples = []
+    for i in range(iterations):
+        if before_each:
+            before_each(i)
+        start = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - start)
+    # throughput of the measured calls only, before_each() is excluded
+    return summarize(samples, sum(samples))
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_importtime(stderr):
+    """
+    Parse ``python -X importtime`` output into (module, self_us, cumulative_us, depth).
+
+    Lines that are not importtime records (the header, warnings) are skipped.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue  # the "self [us] | cumulative | imported package" header
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append((name.strip(), self_us, cumulative_us, depth))
+    return entries
+
+
+def importtime_breakdown(entries, top=20):
+    """Total import time plus the heaviest top-level packages and modules, in ms."""
+    packages = {}
+    for name, self_us, _cumulative, _depth in entries:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+
+    def ms(us):
+        return round(us / 1000, 2)
+
+    return {
+        "modules": len(entries),
+        "total_ms": ms(sum(self_us for _, self_us, _, _ in entries)),
+        "packages": [
+            {"package": package, "self_ms": ms(us)}
+            for package, us in sorted(packages.items(), key=lambda i: i[1], reverse=True)[:top]
+        ],
+        "modules_by_cumulative": [
+            {"module": name, "cumulative_ms": ms(cumulative_us), "self_ms": ms(self_us)}
+            for name, self_us, cumulative_us, _ in sorted(entries, key=lambda e: e[2], reverse=True)[:top]
+        ],
+    }
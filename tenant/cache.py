@@ -0,0 +1,244 @@
+# tenant/cache.py
+import time
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+from tenant.resolver import LRUCache
+
+
+MISS = object()
+
+
+'''
+    mentality: one cache namespace per tenant schema that can be dropped in O(1).
+    - every key is "tenant:<schema>:<generation>:<key>"; bump() increments the
+      schema's generation in the shared cache, so all older keys stop being
+      read and simply expire. Nothing is deleted key by key.
+    - hits are served from a process-local LRU first, the shared backend is
+      only asked on a local miss.
+    - the generation itself is also held locally for TENANT_CACHE_GENERATION_TTL
+      seconds: a bump in this process is seen at once, other processes see it
+      within that window.
+    - a generation that was evicted from the shared cache restarts from the
+      current time in ms, never from a number that was already used.
+    - writers call bump_on_commit(): bumping inside an open transaction would
+      let a concurrent request cache the pre-commit rows under the new
+      generation.
+    - the alias must be shared by all server processes (Redis, Memcached,
+      DatabaseCache). With a LocMemCache a bump never reaches the other
+      workers, so cache_tenant_response stays off and check
+      tenant.W001 warns.
+'''
+class TenantCache:
+    def __init__(self, alias=DEFAULT_CACHE_ALIAS, local_size=1000, local_ttl=60, generation_ttl=1):
+        self.alias = alias
+        self.local = LRUCache(maxsize=local_size, ttl=local_ttl)
+        self.generations = LRUCache(maxsize=local_size, ttl=generation_ttl)
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    @property
+    def is_shared(self):
+        """False when the backend lives inside each process (LocMemCache)."""
+        return not isinstance(self.shared, LocMemCache)
+
+    def generation(self, schema_name):
+        generation = self.generations.get(schema_name)
+        if generation is None:
+            key = self._generation_key(schema_name)
+            generation = self.shared.get(key)
+            if generation is None:
+                self.shared.add(key, _fresh_generation(), timeout=None)
+                generation = self.shared.get(key, 0)
+            self.generations.set(schema_name, generation)
+        return generation
+
+    def make_key(self, key, schema_name=None):
+        schema_name = schema_name or connection.schema_name
+        return f"tenant:{schema_name}:{self.generation(schema_name)}:{key}"
+
+    def peek(self, key, schema_name):
+        """Local-tier lookup only, never touches the shared backend: value or MISS."""
+        generation = self.generations.get(schema_name)
+        if generation is None:
+            return MISS
+        value = self.local.get(f"tenant:{schema_name}:{generation}:{key}")
+        return MISS if value is None else value
+
+    def get(self, key, default=None, schema_name=None):
+        full_key = self.make_key(key, schema_name)
+        value = self.local.get(full_key)
+        if value is None:
+            value = self.shared.get(full_key, MISS)
+            if value is MISS:
+                return default
+            self.local.set(full_key, value)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, schema_name=None):
+        full_key = self.make_key(key, schema_name)
+        self.shared.set(full_key, value, timeout)
+        self.local.set(full_key, value)
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, schema_name=None):
+        value = self.get(key, MISS, schema_name)
+        if value is MISS:
+            value = default() if callable(default) else default
+            self.set(key, value, timeout, schema_name)
+        return value
+
+    def bump(self, schema_name=None):
+        """Invalidate everything cached for ``schema_name`` (default: current schema)."""
+        schema_name = schema_name or connection.schema_name
+        key = self._generation_key(schema_name)
+        try:
+            generation = self.shared.incr(key)
+        except ValueError:
+            generation = _fresh_generation()
+            self.shared.set(key, generation, timeout=None)
+        self.generations.set(schema_name, generation)
+        return generation
+
+    def bump_on_commit(self, schema_name=None, using=None):
+        """bump() once the current transaction commits (at once outside one)."""
+        # resolve the schema now, the connection may switch before the commit
+        schema_name = schema_name or connection.schema_name
+        transaction.on_commit(lambda: self.bump(schema_name), using=using)
+
+    def clear_local(self):
+        self.local.clear()
+        self.generations.clear()
+
+    @staticmethod
+    def _generation_key(schema_name):
+        return f"tenant-cache-generation:{schema_name}"
+
+
+def _fresh_generation():
+    return int(time.time() * 1000)
+
+
+tenant_cache = TenantCache(
+    alias=getattr(settings, "TENANT_CACHE_ALIAS", DEFAULT_CACHE_ALIAS),
+    local_size=getattr(settings, "TENANT_CACHE_LOCAL_SIZE", 1000),
+    local_ttl=getattr(settings, "TENANT_CACHE_LOCAL_TTL", 60),
+    generation_ttl=getattr(settings, "TENANT_CACHE_GENERATION_TTL", 1),
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    if tenant_cache.is_shared:
+        return []
+    return [
+        Warning(
+            f"TENANT_CACHE_ALIAS '{tenant_cache.alias}' is a process-local LocMemCache.",
+            hint=(
+                "Cache invalidation (tenant.cache, users.permissions, plan "
+                "entitlements) won't reach other server processes and "
+                "cache_tenant_response is disabled. Use a shared backend."
+            ),
+            id="tenant.W001",
+        )
+    ]
+
+
+#----------view decorator------------
+'''
+    mentality: cache whole GET responses per tenant, keyed by the full path.
+    - only 200, non-streaming responses of views whose output doesn't depend
+      on the user are cached.
+    - put it outside @conditional: a hit answers If-None-Match from the cached
+      ETag without running the version query.
+    - does nothing (calls the view) unless tenant_cache.is_shared: a
+      per-process copy would keep serving, and 304-ing, data another worker
+      has changed.
+'''
+def cache_tenant_response(timeout=DEFAULT_TIMEOUT, key_prefix="view"):
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def inner(request, *args, **kwargs):
+                if request.method not in ("GET", "HEAD") or not tenant_cache.is_shared:
+                    return await view(request, *args, **kwargs)
+                key = _response_key(request, key_prefix)
+                schema_name = _request_schema(request)
+                cached = tenant_cache.peek(key, schema_name)
+                if cached is MISS:
+                    cached = await sync_to_async(tenant_cache.get)(key, MISS, schema_name)
+                if cached is not MISS:
+                    return _from_cache(request, cached)
+                response = await view(request, *args, **kwargs)
+                if _cacheable(response):
+                    await sync_to_async(tenant_cache.set)(key, _to_cache(response), timeout, schema_name)
+                return response
+
+        else:
+
+            @wraps(view)
+            def inner(request, *args, **kwargs):
+                if request.method not in ("GET", "HEAD") or not tenant_cache.is_shared:
+                    return view(request, *args, **kwargs)
+                key = _response_key(request, key_prefix)
+                schema_name = _request_schema(request)
+                cached = tenant_cache.get(key, MISS, schema_name)
+                if cached is not MISS:
+                    return _from_cache(request, cached)
+                response = view(request, *args, **kwargs)
+                if _cacheable(response):
+                    tenant_cache.set(key, _to_cache(response), timeout, schema_name)
+                return response
+
+        return inner
+
+    return decorator
+
+
+def _request_schema(request):
+    tenant = getattr(request, "tenant", None)
+    return tenant.schema_name if tenant is not None else connection.schema_name
+
+
+def _response_key(request, key_prefix):
+    return f"{key_prefix}:{request.get_full_path()}"
+
+
+def _cacheable(response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.has_header("Set-Cookie")
+        and not response.cookies
+    )
+
+
+def _to_cache(response):
+    return (response.content, response.status_code, tuple(response.items()))
+
+
+def _from_cache(request, cached):
+    content, status, headers = cached
+    header_map = dict(headers)
+    etag = header_map.get("ETag")
+    if etag:
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified.headers.setdefault("ETag", etag)
+            return not_modified
+    response = HttpResponse(content, status=status)
+    for name, value in headers:
+        response[name] = value
+    return response
@@ -0,0 +1,142 @@
+# tenant/instrumentation.py
+import bisect
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+'''
+    mentality: know which tenant drives DB load.
+    - TenantMetricsMiddleware records one sample per request per tenant schema.
+    - samples go into fixed-bucket histograms kept in this process; they are
+      exported as JSON by tenant.api.views.metrics.
+    - the same SQL (with placeholders) run many times in one request is
+      flagged as a likely N+1 and logged right away.
+'''
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+METRICS = {
+    "latency_ms": LATENCY_BUCKETS_MS,
+    "sql_ms": LATENCY_BUCKETS_MS,
+    "serialization_ms": LATENCY_BUCKETS_MS,
+    "queries": COUNT_BUCKETS,
+    "response_bytes": SIZE_BUCKETS,
+}
+
+
+class Histogram:
+    """Counts per upper bound; the last bucket catches everything above."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (None = overflow)."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return self.bounds[index] if index < len(self.bounds) else None
+        return None
+
+    def as_dict(self):
+        labels = [f"le_{b}" for b in self.bounds] + ["inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class TenantMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._histograms = defaultdict(
+                lambda: {name: Histogram(bounds) for name, bounds in METRICS.items()}
+            )
+            self._n_plus_one = Counter()
+
+    def record(self, schema_name, sample, n_plus_one=False):
+        with self._lock:
+            histograms = self._histograms[schema_name]
+            for name, value in sample.items():
+                if value is not None:
+                    histograms[name].observe(value)
+            if n_plus_one:
+                self._n_plus_one[schema_name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                schema_name: {
+                    "requests": histograms["latency_ms"].count,
+                    "n_plus_one_requests": self._n_plus_one[schema_name],
+                    **{name: h.as_dict() for name, h in histograms.items()},
+                }
+                for schema_name, histograms in self._histograms.items()
+            }
+
+
+tenant_metrics = TenantMetrics()
+
+
+class QueryRecorder:
+    """connection.execute_wrapper() that counts and times every query."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    def repeated(self, threshold):
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+@contextmanager
+def measure(request, name):
+    """Add the time spent in the block to ``request`` under ``name`` (seconds)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = request.__dict__.setdefault("_metric_timings", Counter())
+        timings[name] += time.perf_counter() - start
+
+
+def n_plus_one_threshold():
+    return getattr(settings, "TENANT_METRICS_N_PLUS_ONE_THRESHOLD", 5)
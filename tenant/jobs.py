@@ -0,0 +1,210 @@
+# tenant/jobs.py
+import logging
+import os
+import socket
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+logger = logging.getLogger("tenant.jobs")
+
+JOB_HANDLERS = {}
+
+
+'''
+    mentality: a job queue in the database we already have, no broker.
+    - enqueue() inserts a Job row in the caller's transaction: if the request
+      rolls back, the job never existed.
+    - workers claim due jobs with SELECT ... FOR UPDATE SKIP LOCKED, so any
+      number of workers share the table without handing out a job twice.
+    - a failed job is retried with exponential backoff until max_attempts,
+      then left as failed with its traceback in last_error.
+    - a running job's locked_at is refreshed every JOB_HEARTBEAT_INTERVAL
+      seconds; a worker that dies mid-job stops refreshing it, and
+      release_stale_jobs() puts the job back after JOB_LOCK_TIMEOUT (or fails
+      it when it is out of attempts).
+    - a job's outcome is only written by the worker that still holds its
+      lock (locked_by), never over a later claim.
+    - handlers must be idempotent: a job can run again after a crash, and
+      lifecycle handlers act on the tenant's current state, not the payload.
+'''
+def job_handler(name):
+    """Register ``func(job)`` as the handler of jobs called ``name``."""
+    def decorator(func):
+        JOB_HANDLERS[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, tenant=None, payload=None, delay=0, max_attempts=None):
+    from tenant.models import Job
+
+    if name not in JOB_HANDLERS:
+        raise ValueError(f"no job handler registered for {name!r}")
+    job = Job(
+        name=name,
+        tenant=tenant,
+        payload=payload or {},
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+    if max_attempts is not None:
+        job.max_attempts = max_attempts
+    job.save()
+    return job
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_jobs(limit, worker=None):
+    """Lock up to ``limit`` due jobs for ``worker`` and mark them running."""
+    from tenant.models import Job
+
+    worker = worker or worker_id()
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("tenant")
+            .filter(status=Job.Status.PENDING, run_after__lte=now)
+            .order_by("run_after", "id")[:limit]
+        )
+        if jobs:
+            Job.objects.filter(id__in=[job.id for job in jobs]).update(
+                status=Job.Status.RUNNING,
+                locked_at=now,
+                locked_by=worker,
+                attempts=F("attempts") + 1,
+                updated_at=now,
+            )
+    for job in jobs:
+        job.status, job.locked_at, job.attempts = Job.Status.RUNNING, now, job.attempts + 1
+        job.locked_by = worker
+    return jobs
+
+
+@contextmanager
+def heartbeat(job, interval=None):
+    """Refresh ``job.locked_at`` while the block runs, from a side thread."""
+    from django.db import connection
+    from tenant.models import Job
+
+    if interval is None:
+        interval = getattr(settings, "JOB_HEARTBEAT_INTERVAL", 60)
+    done = threading.Event()
+
+    def beat():
+        try:
+            while not done.wait(interval):
+                try:
+                    Job.objects.filter(
+                        id=job.id, status=Job.Status.RUNNING, locked_by=job.locked_by,
+                    ).update(locked_at=timezone.now())
+                except Exception:
+                    logger.exception("Heartbeat of job %s failed", job)
+        finally:
+            # this thread's own connection
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f"job-{job.id}-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+
+
+def run_job(job):
+    """Run one claimed job and record the outcome. Returns True on success."""
+    from tenant.models import Job
+
+    handler = JOB_HANDLERS.get(job.name)
+    # only touch the row while it is still our claim
+    ours = Job.objects.filter(id=job.id, status=Job.Status.RUNNING, locked_by=job.locked_by)
+    try:
+        if handler is None:
+            raise LookupError(f"no job handler registered for {job.name!r}")
+        with heartbeat(job):
+            handler(job)
+    except Exception:
+        error = traceback.format_exc()
+        now = timezone.now()
+        if job.attempts >= job.max_attempts:
+            status, run_after = Job.Status.FAILED, job.run_after
+            logger.error("Job %s failed permanently:\n%s", job, error)
+        else:
+            status, run_after = Job.Status.PENDING, now + timedelta(seconds=retry_delay(job.attempts))
+            logger.warning("Job %s failed, retry at %s:\n%s", job, run_after, error)
+        if not ours.update(
+            status=status, run_after=run_after, last_error=error, locked_at=None, updated_at=now,
+        ):
+            logger.warning("Job %s lost its lock, outcome not recorded", job)
+        return False
+
+    now = timezone.now()
+    if not ours.update(
+        status=Job.Status.DONE, finished_at=now, locked_at=None, last_error="", updated_at=now,
+    ):
+        logger.warning("Job %s lost its lock, outcome not recorded", job)
+    return True
+
+
+def retry_delay(attempts):
+    base = getattr(settings, "JOB_RETRY_BASE_DELAY", 10)
+    return min(base * 2 ** (attempts - 1), getattr(settings, "JOB_RETRY_MAX_DELAY", 3600))
+
+
+def release_stale_jobs():
+    """
+    Put jobs whose worker stopped responding back in the queue, or fail them
+    when they have no attempts left. Returns the number put back.
+    """
+    from tenant.models import Job
+
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=getattr(settings, "JOB_LOCK_TIMEOUT", 600))
+    stale = Job.objects.filter(status=Job.Status.RUNNING, locked_at__lt=cutoff)
+    # locked_by is cleared so the lost worker can't record an outcome later
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.Status.FAILED, locked_at=None, locked_by="", updated_at=now,
+        last_error="worker stopped responding on the last attempt",
+    )
+    if failed:
+        logger.error("%d stale job(s) out of attempts, marked failed", failed)
+    return stale.filter(attempts__lt=F("max_attempts")).update(
+        status=Job.Status.PENDING, locked_at=None, locked_by="", run_after=now, updated_at=now,
+    )
+
+
+#----------tenant lifecycle handlers------------
+'''
+    mentality: Tenant.attach_plan / create_schema_later save the row (the
+    resolver cache must see the change at once) and queue the slow or
+    external work here. Cache invalidation is not queued, the model does it
+    on commit.
+'''
+CREATE_SCHEMA = "tenant.create_schema"
+PLAN_CHANGED = "tenant.plan_changed"
+
+
+@job_handler(CREATE_SCHEMA)
+def create_tenant_schema(job):
+    from tenant.provisioning import create_schema
+
+    schema_name, created, seconds = create_schema(job.tenant.schema_name)
+    logger.info("Schema %s %s in %.1fs", schema_name, "created" if created else "already existed", seconds)
+
+
+@job_handler(PLAN_CHANGED)
+def tenant_plan_changed(job):
+    # payment and quota work for the new plan goes here
+    logger.info("Tenant %s moved to plan %s", job.tenant.schema_name, job.payload.get("plan_id"))
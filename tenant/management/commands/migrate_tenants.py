@@ -0,0 +1,73 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand, call_command
+from django.test.utils import override_settings
+from django_tenants.utils import get_creation_fakes_migrations
+
+from tenant.provisioning import close_connections, ensure_template_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Migrate the public schema, the tenant template schema (when new tenants "
+        "are cloned from it) and then every tenant schema in parallel"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.TENANT_MULTIPROCESSING_MAX_PROCESSES,
+            help="Tenant schemas migrated concurrently",
+        )
+        parser.add_argument(
+            "--template-only",
+            action="store_true",
+            help="Only create/migrate the template schema",
+        )
+        parser.add_argument(
+            "--skip-shared",
+            action="store_true",
+            help="Don't migrate the public schema first",
+        )
+
+    def handle(self, *args, **options):
+        verbosity = options["verbosity"]
+        started = time.perf_counter()
+
+        if not options["skip_shared"] and not options["template_only"]:
+            call_command("migrate_schemas", shared=True, interactive=False, verbosity=verbosity)
+
+        # the template is only read when new tenants are cloned from it
+        if get_creation_fakes_migrations():
+            step = time.perf_counter()
+            created = ensure_template_schema(verbosity=verbosity)
+            self.stdout.write(
+                f"template schema '{settings.TENANT_BASE_SCHEMA}' "
+                f"{'created' if created else 'migrated'} in {time.perf_counter() - step:.2f}s"
+            )
+        elif options["template_only"]:
+            self.stdout.write("template cloning is off (TENANT_CLONE_TEMPLATE), no template schema to migrate")
+        if options["template_only"]:
+            return
+
+        step = time.perf_counter()
+        workers = max(1, options["workers"])
+        # its forked workers must not inherit our pooled connections
+        close_connections()
+        # the multiprocessing executor reads its pool size from settings
+        with override_settings(TENANT_MULTIPROCESSING_MAX_PROCESSES=workers):
+            call_command(
+                "migrate_schemas",
+                tenant=True,
+                executor="multiprocessing",
+                interactive=False,
+                verbosity=verbosity,
+            )
+        self.stdout.write(
+            f"tenant schemas migrated with {workers} workers in {time.perf_counter() - step:.2f}s"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Migrations finished in {time.perf_counter() - started:.2f}s")
+        )
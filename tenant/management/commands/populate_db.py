@@ -1,38 +1,96 @@
 import json
-from django.core.management import BaseCommand, call_command
+import os
+import time
+from django.core.management import BaseCommand, CommandError, call_command
 from django.conf import settings
 from django.utils import timezone
-from django_tenants.utils import schema_context
+from django.utils.functional import cached_property
+from django_tenants.utils import get_creation_fakes_migrations, schema_context
 
 from tenant.models import Tenant, Domain
 from users.models import CustomUser
 from subscriptions.models import SubscriptionPlan
 from todo.models import Task
+from todo.factories import DEFAULT_BATCH_SIZE, bulk_insert, generate_tasks
+from tenant.provisioning import create_schema, ensure_template_schema, run_in_pool
 
 
 class Command(BaseCommand):
     help = "Create tenants, tenant admins, role-based users, and optionally dummy tasks"
     tenants_file = "tenant/data/tenants.json"
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    @cached_property
+    def tenants(self):
+        # read on first use, not when the command is built (--help, call_command)
         with open(self.tenants_file) as f:
-            self.tenants = json.load(f)
+            return json.load(f)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenants-file",
+            default=None,
+            help=f"JSON file describing the tenants (default: {self.tenants_file})",
+        )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="bulk_create tenants/domains and create schemas in parallel",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processes used to create and migrate schemas in --bulk mode",
+        )
+        parser.add_argument(
+            "--tasks-per-tenant",
+            type=int,
+            default=0,
+            help="Top every tenant up to this many synthetic tasks (0 = skip)",
+        )
+        parser.add_argument(
+            "--task-batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Rows per validated bulk_create batch when generating tasks",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=None,
+            help="Seed for reproducible synthetic tasks",
+        )
 
     def handle(self, *args, **kwargs):
-        # Ensure all migrations are applied
-        call_command("migrate", interactive=False)
+        if kwargs["tenants_file"]:
+            self.tenants_file = kwargs["tenants_file"]
+            self.__dict__.pop("tenants", None)
 
-        # Step 1: Create tenants
-        for data in self.tenants:
-            tenant = self.create_tenant(data)
+        # Ensure all migrations are applied, including the template schema
+        # new tenants are cloned from
+        call_command("migrate_tenants", workers=max(1, kwargs["workers"]))
 
-            # Step 2: Create tenant admin
-            self.create_tenant_admin(tenant, data["owner"])
+        if kwargs["bulk"]:
+            self.bulk_provision(workers=max(1, kwargs["workers"]))
+        else:
+            # Step 1: Create tenants
+            for data in self.tenants:
+                tenant = self.create_tenant(data)
 
-        self.stdout.write(
-            self.style.SUCCESS("✅ Tenants and admins created successfully")
-        )
+                # Step 2: Create tenant admin
+                self.create_tenant_admin(tenant, data["owner"])
+
+            self.stdout.write(
+                self.style.SUCCESS("✅ Tenants and admins created successfully")
+            )
+
+        # Step 4: Create dummy tasks
+        if kwargs["tasks_per_tenant"] > 0:
+            self.create_dummy_tasks(
+                kwargs["tasks_per_tenant"],
+                batch_size=max(1, kwargs["task_batch_size"]),
+                seed=kwargs["seed"],
+            )
     
     # ==================================================
     # STEP 1: CREATE TENANT
@@ -66,6 +124,121 @@ class Command(BaseCommand):
 
         return tenant
 
+    # ==================================================
+    # STEP 1 (BULK): CREATE TENANTS, DOMAINS AND SCHEMAS
+    # ==================================================
+    def bulk_provision(self, workers):
+        """
+        Same result as the per-tenant loop, but:
+        - plans are fetched once, tenants and domains are bulk_created
+        - schemas are created and migrated on a process pool
+
+        Rows are committed before schemas are built; re-running the command
+        picks up any schema that failed.
+        """
+        started = time.perf_counter()
+        plans = {plan.code: plan for plan in SubscriptionPlan.objects.all()}
+
+        schema_names = [data["schema_name"] for data in self.tenants]
+        existing = set(
+            Tenant.objects.filter(schema_name__in=schema_names)
+            .values_list("schema_name", flat=True)
+        )
+
+        plan_for = {}
+        new_tenants = []
+        for data in self.tenants:
+            plan_code = data.get("plan") or "free"
+            if plan_code not in plans:
+                raise CommandError(f"Unknown plan '{plan_code}' for {data['schema_name']}")
+            plan_for[data["schema_name"]] = plans[plan_code]
+            if data["schema_name"] in existing:
+                continue
+            new_tenants.append(Tenant(
+                schema_name=data["schema_name"],
+                name=data["name"],
+                slug=data["slug"],
+                is_active=data.get("is_active", True),
+                plan=plans[plan_code],
+            ))
+        # bulk_create skips Tenant.save(), so no schema is created here
+        Tenant.objects.bulk_create(new_tenants)
+
+        tenants = {
+            t.schema_name: t
+            for t in Tenant.objects.filter(schema_name__in=schema_names)
+        }
+        # keep existing tenants on the plan from the data file
+        changed = []
+        for schema_name, tenant in tenants.items():
+            if tenant.plan_id != plan_for[schema_name].id:
+                tenant.plan = plan_for[schema_name]
+                changed.append(tenant)
+        Tenant.objects.bulk_update(changed, ["plan"])
+        self.bulk_create_domains(tenants)
+        self.stdout.write(
+            f"{len(new_tenants)} tenants inserted ({len(existing)} already existed) "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+
+        pending = [
+            name for name in schema_names
+            if name != settings.PUBLIC_SCHEMA_NAME
+        ]
+        done = 0
+
+        def report(schema_name, result, error):
+            nonlocal done
+            done += 1
+            prefix = f"[{done}/{len(pending)}] {schema_name}"
+            if error is not None:
+                self.stderr.write(self.style.ERROR(f"{prefix} failed: {error}"))
+                return
+            _, created, seconds = result
+            status = "created" if created else "exists"
+            self.stdout.write(f"{prefix} {status} in {seconds:.2f}s")
+
+        if pending and get_creation_fakes_migrations():
+            # migrated template + clone_schema() in place before the workers clone
+            ensure_template_schema(verbosity=0)
+        failures = run_in_pool(create_schema, pending, workers, on_result=report)
+
+        for data in self.tenants:
+            self.create_tenant_admin(tenants[data["schema_name"]], data["owner"])
+
+        if failures:
+            raise CommandError(
+                f"{len(failures)} schema(s) failed: "
+                + ", ".join(name for name, _ in failures)
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {len(pending)} tenant schemas provisioned with {workers} workers "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+        )
+
+    def bulk_create_domains(self, tenants):
+        wanted = {}
+        for data in self.tenants:
+            domain_name = settings.BASE_DOMAIN
+            if data.get("subdomain"):
+                domain_name = f"{data['subdomain']}.{settings.BASE_DOMAIN}"
+            wanted[domain_name] = data["schema_name"]
+
+        existing = set(
+            Domain.objects.filter(domain__in=wanted).values_list("domain", flat=True)
+        )
+        Domain.objects.bulk_create([
+            Domain(
+                tenant=tenants[schema_name],
+                domain=domain_name,
+                is_primary=schema_name == settings.PUBLIC_SCHEMA_NAME,
+            )
+            for domain_name, schema_name in wanted.items()
+            if domain_name not in existing
+        ])
+
     # ==================================================
     # STEP 2: CREATE TENANT ADMIN
     # ==================================================
@@ -126,39 +299,39 @@ class Command(BaseCommand):
     # ==================================================
     # STEP 4: CREATE DUMMY TASKS
     # ==================================================
-    def create_dummy_tasks(self):
+    def create_dummy_tasks(self, tasks_per_tenant, batch_size=DEFAULT_BATCH_SIZE, seed=None):
+        """
+        Top each tenant up to ``tasks_per_tenant`` synthetic tasks, spread
+        over the tenant's owner and role users.
+        """
         for data in self.tenants:
             if data["schema_name"] == settings.PUBLIC_SCHEMA_NAME:
                 continue
 
             with schema_context(data["schema_name"]):
-                user = CustomUser.objects.get(email=data["owner"]["email"])
+                emails = [data["owner"]["email"]]
+                emails += [u["email"] for u in data.get("role_users", [])]
+                users = list(CustomUser.objects.filter(email__in=emails).order_by("id"))
+                if not users:
+                    self.stderr.write(f"{data['schema_name']}: no users, skipping tasks")
+                    continue
 
-                if Task.objects.exists():
+                existing = Task.objects.count()
+                missing = tasks_per_tenant - existing
+                if missing <= 0:
                     continue
 
-                tasks = [
-                    Task(
-                        user=user,
-                        title="Setup project",
-                        description="Initialize tenant project structure",
-                        completed=True,
-                        published_at=timezone.now(),
-                    ),
-                    Task(
-                        user=user,
-                        title="Create APIs",
-                        description="Build CRUD APIs for tasks",
-                        completed=False,
-                    ),
-                    Task(
-                        user=user,
-                        title="Deploy app",
-                        description="Deploy tenant application to server",
-                        completed=False,
-                    ),
-                ]
-
-                for task in tasks:
-                    task.full_clean()
-                    task.save()
+                started = time.perf_counter()
+
+                def progress(inserted):
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f"{data['schema_name']}: {inserted}/{missing} tasks "
+                        f"({inserted / elapsed:,.0f} rows/s)"
+                    )
+
+                bulk_insert(
+                    generate_tasks(users, missing, start=existing, seed=seed),
+                    batch_size=batch_size,
+                    on_batch=progress,
+                )
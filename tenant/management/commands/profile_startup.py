@@ -0,0 +1,63 @@
+import json
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from tenant.benchmarks import importtime_breakdown, measure, parse_importtime
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold start of another manage.py invocation: wall time over N fresh "
+        "interpreters plus a python -X importtime breakdown by package and module"
+    )
+    # a diagnostic, the profiled command runs the checks it normally would
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "args", nargs="*", metavar="command",
+            help="manage.py command line to profile (default: help), put it after --",
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreter runs to time")
+        parser.add_argument("--top", type=int, default=15, help="Packages / modules to list")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1")
+        command = [sys.executable, str(settings.BASE_DIR / "manage.py"), *(args or ["help"])]
+        def run(i):
+            result = subprocess.run(command, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise CommandError(f"{' '.join(command[1:])} failed:\n{result.stderr}")
+
+        wall = measure(run, options["repeat"], warmup=1)
+        traced = subprocess.run(
+            [sys.executable, "-X", "importtime", *command[1:]],
+            capture_output=True, text=True,
+        )
+        report = {
+            "command": command[2:],
+            "wall": wall,
+            "imports": importtime_breakdown(parse_importtime(traced.stderr), top=options["top"]),
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f"manage.py {' '.join(report['command'])}: p50 {wall['p50_ms']} ms, "
+            f"max {wall['max_ms']} ms over {wall['n']} runs"
+        )
+        imports = report["imports"]
+        self.stdout.write(f"imports: {imports['modules']} modules, {imports['total_ms']} ms")
+        self.stdout.write("\nself time by package:")
+        for row in imports["packages"]:
+            self.stdout.write(f"  {row['self_ms']:>9.2f} ms  {row['package']}")
+        self.stdout.write("\nslowest imports (cumulative):")
+        for row in imports["modules_by_cumulative"]:
+            self.stdout.write(f"  {row['cumulative_ms']:>9.2f} ms  {row['module']}")
@@ -0,0 +1,42 @@
+from django.core.management import BaseCommand, CommandError
+from django_tenants.utils import get_public_schema_name, schema_context
+
+from tenant.models import Tenant
+from tenant.reporting import DEFAULT_BATCH_SIZE
+from tenant.usage import reconcile_tenants
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the per-tenant usage counters (members, tasks, storage) from the "
+        "real tables and fix any drift. Safe to run while the site is live."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--schema", action="append", default=[], help="Only these schemas (repeatable)")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Tenants per transaction")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        tenants = Tenant.objects.order_by("id").only("id", "schema_name", "name", "plan_id")
+        if options["schema"]:
+            tenants = tenants.filter(schema_name__in=options["schema"])
+        tenants = list(tenants)
+
+        drifted = 0
+        with schema_context(get_public_schema_name()):
+            for start in range(0, len(tenants), options["batch_size"]):
+                batch = tenants[start:start + options["batch_size"]]
+                drift = reconcile_tenants(batch)
+                drifted += len(drift)
+                names = {tenant.id: tenant.schema_name for tenant in batch}
+                for tenant_id, (old, new) in sorted(drift.items()):
+                    self.stdout.write(
+                        f"  {names[tenant_id]}: members/tasks/bytes {old} -> {new}"
+                    )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Reconciled {len(tenants)} tenant(s), {drifted} had drifted"
+        ))
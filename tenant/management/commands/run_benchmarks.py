@@ -0,0 +1,192 @@
+import json
+import platform
+import secrets
+import tempfile
+import time
+from io import StringIO
+
+import django
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError, call_command
+from django.test import Client
+from django.utils import timezone
+from django_tenants.utils import get_tenant_domain_model, schema_context
+
+from tenant.benchmarks import git_revision, measure
+from tenant.cache import tenant_cache as response_cache
+from tenant.middleware import CachedTenantMiddleware
+from tenant.models import Tenant
+from tenant.resolver import tenant_cache
+from todo.models import Task
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Provision N benchmark tenants with M tasks each against the configured "
+        "Postgres and report throughput and p50/p99 latency of the hot paths as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tenants", type=int, default=5, help="Tenants to provision")
+        parser.add_argument("--tasks", type=int, default=1000, help="Tasks per tenant")
+        parser.add_argument("--iterations", type=int, default=200, help="Requests per benchmark")
+        parser.add_argument("--workers", type=int, default=4, help="populate_db --workers")
+        parser.add_argument("--prefix", default="bench", help="Schema/subdomain prefix")
+        parser.add_argument("--output", default=None, help="Write the JSON report here instead of stdout")
+        parser.add_argument("--keep", action="store_true", help="Keep the benchmark tenants afterwards")
+
+    def handle(self, *args, **options):
+        if options["tenants"] < 1 or options["iterations"] < 1:
+            raise CommandError("--tenants and --iterations must be at least 1")
+
+        tenants = self.tenant_data(options["prefix"], options["tenants"])
+        hostnames = [f"{t['subdomain']}.{settings.BASE_DOMAIN}" for t in tenants]
+        results = {}
+        try:
+            results["populate_db"] = self.bench_populate_db(tenants, options)
+            results["tenant_resolution_cold"] = self.bench_resolution(hostnames, options["iterations"], cold=True)
+            results["tenant_resolution_warm"] = self.bench_resolution(hostnames, options["iterations"], cold=False)
+            # the views sit behind cache_tenant_response: measure the view
+            # path itself and the cached path separately
+            for cached in (False, True):
+                suffix = "_cached" if cached else ""
+                results[f"task_list{suffix}"] = self.bench_task_list(
+                    tenants, hostnames, options["iterations"], cached,
+                )
+                results[f"task_detail{suffix}"] = self.bench_task_detail(
+                    tenants, hostnames, options["iterations"], cached,
+                )
+        finally:
+            if not options["keep"]:
+                self.cleanup(tenants)
+
+        report = {
+            "meta": {
+                "git_revision": git_revision(),
+                "timestamp": timezone.now().isoformat(),
+                "tenants": options["tenants"],
+                "tasks_per_tenant": options["tasks"],
+                "iterations": options["iterations"],
+                "python": platform.python_version(),
+                "django": django.get_version(),
+            },
+            "results": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+            self.stderr.write(f"report written to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    # ==================================================
+    # SETUP / TEARDOWN
+    # ==================================================
+    def tenant_data(self, prefix, count):
+        return [
+            {
+                "name": f"{prefix.title()} Tenant {i}",
+                "slug": f"{prefix}{i}",
+                "schema_name": f"{prefix}{i}",
+                "subdomain": f"{prefix}{i}",
+                "plan": "free",
+                "is_active": True,
+                "owner": {
+                    "email": f"owner@{prefix}{i}.{settings.BASE_DOMAIN}",
+                    "password": secrets.token_urlsafe(16),
+                },
+            }
+            for i in range(1, count + 1)
+        ]
+
+    def cleanup(self, tenants):
+        for tenant in Tenant.objects.filter(schema_name__in=[t["schema_name"] for t in tenants]):
+            tenant.delete(force_drop=True)
+        # queryset delete: UserProfile.delete() refuses without force_drop
+        CustomUser.objects.filter(email__in=[t["owner"]["email"] for t in tenants]).delete()
+
+    # ==================================================
+    # BENCHMARKS
+    # ==================================================
+    def bench_populate_db(self, tenants, options):
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as f:
+            json.dump(tenants, f)
+            f.flush()
+            started = time.perf_counter()
+            call_command(
+                "populate_db",
+                bulk=True,
+                workers=options["workers"],
+                tenants_file=f.name,
+                tasks_per_tenant=options["tasks"],
+                seed=1,
+                stdout=StringIO(),
+            )
+            elapsed = time.perf_counter() - started
+        return {
+            "n": len(tenants),
+            "seconds": round(elapsed, 3),
+            "tenants_per_s": round(len(tenants) / elapsed, 3),
+            "tasks_per_s": round(len(tenants) * options["tasks"] / elapsed, 1),
+        }
+
+    def bench_resolution(self, hostnames, iterations, cold):
+        middleware = CachedTenantMiddleware(lambda request: None)
+        domain_model = get_tenant_domain_model()
+
+        def resolve(i):
+            middleware.get_tenant(domain_model, hostnames[i % len(hostnames)])
+
+        return measure(
+            resolve,
+            iterations,
+            warmup=0 if cold else len(hostnames),
+            before_each=(lambda i: tenant_cache.clear()) if cold else None,
+        )
+
+    def drop_response_cache(self, tenants, cached):
+        """before_each for measure(): start every uncached call from a new generation."""
+        if cached:
+            return None
+        schema_names = [data["schema_name"] for data in tenants]
+        return lambda i: response_cache.bump(schema_names[i % len(schema_names)])
+
+    def bench_task_list(self, tenants, hostnames, iterations, cached):
+        client = Client()
+
+        def get(i):
+            response = client.get("/api/tasks/", HTTP_HOST=hostnames[i % len(hostnames)])
+            if response.status_code != 200:
+                raise CommandError(f"task_list returned {response.status_code}")
+
+        return measure(
+            get,
+            iterations,
+            warmup=len(hostnames),
+            before_each=self.drop_response_cache(tenants, cached),
+        )
+
+    def bench_task_detail(self, tenants, hostnames, iterations, cached):
+        ids = []
+        for data in tenants:
+            with schema_context(data["schema_name"]):
+                ids.append(list(Task.objects.values_list("id", flat=True)[:100]))
+        if not all(ids):
+            raise CommandError("Every benchmark tenant needs tasks, use --tasks")
+        client = Client()
+
+        def get(i):
+            index = i % len(hostnames)
+            pk = ids[index][i % len(ids[index])]
+            response = client.get(f"/api/tasks/{pk}/", HTTP_HOST=hostnames[index])
+            if response.status_code != 200:
+                raise CommandError(f"task_detail returned {response.status_code}")
+
+        return measure(
+            get,
+            iterations,
+            warmup=len(hostnames),
+            before_each=self.drop_response_cache(tenants, cached),
+        )
@@ -0,0 +1,74 @@
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import connections
+
+from tenant.jobs import claim_jobs, release_stale_jobs, run_job, worker_id
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs (tenant.jobs) with a bounded number of threads. "
+        "Any number of workers can run side by side."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=getattr(settings, "JOB_WORKER_CONCURRENCY", 4),
+            help="Jobs run at the same time by this worker",
+        )
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to sleep when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="Exit when no job is due instead of polling")
+        parser.add_argument("--max-jobs", type=int, default=0, help="Exit after this many jobs (0 = no limit)")
+
+    def handle(self, *args, **options):
+        concurrency = options["concurrency"]
+        if concurrency < 1:
+            raise CommandError("--concurrency must be at least 1")
+
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        worker = worker_id()
+        processed = failed = 0
+        self.stdout.write(f"worker {worker}: {concurrency} thread(s)")
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while not self.stopping:
+                released = release_stale_jobs()
+                if released:
+                    self.stderr.write(f"released {released} stale job(s)")
+
+                limit = concurrency
+                if options["max_jobs"]:
+                    limit = min(limit, options["max_jobs"] - processed)
+                jobs = claim_jobs(limit, worker)
+                if not jobs:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                # claimed jobs are running: finish them even if asked to stop
+                for ok in pool.map(self.run_in_thread, jobs):
+                    processed += 1
+                    failed += not ok
+                if options["max_jobs"] and processed >= options["max_jobs"]:
+                    break
+
+        self.stdout.write(self.style.SUCCESS(f"worker {worker}: {processed} job(s), {failed} failed"))
+
+    def run_in_thread(self, job):
+        try:
+            return run_job(job)
+        finally:
+            # each pool thread has its own connection, don't leave it idle
+            connections.close_all()
+
+    def stop(self, signum, frame):
+        self.stopping = True
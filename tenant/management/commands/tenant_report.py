@@ -0,0 +1,48 @@
+import sys
+
+from django.core.management import BaseCommand, CommandError
+from django_tenants.utils import schema_context, get_public_schema_name
+
+from todo.pagination import stream_json_array
+from tenant.reporting import REPORTS, csv_lines, get_report, report_columns, run_report
+
+
+class Command(BaseCommand):
+    help = (
+        "Cross-tenant report built from one UNION ALL query per batch of schemas, "
+        "joined with the tenant plan, written as CSV or JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("report", choices=sorted(REPORTS), help="Report to run")
+        parser.add_argument("--format", choices=("csv", "json"), default="csv")
+        parser.add_argument("--by", choices=("tenant", "plan"), default="tenant", help="One row per tenant or per plan")
+        parser.add_argument("--batch-size", type=int, default=None, help="Schemas per query (TENANT_REPORT_BATCH_SIZE)")
+        parser.add_argument("--active-only", action="store_true", help="Skip deactivated tenants")
+        parser.add_argument("--output", default=None, help="Write here instead of stdout")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] is not None and options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        report = get_report(options["report"])
+        out = open(options["output"], "w", newline="") if options["output"] else sys.stdout
+        try:
+            with schema_context(get_public_schema_name()):
+                rows = run_report(
+                    report,
+                    batch_size=options["batch_size"],
+                    active_only=options["active_only"],
+                    by=options["by"],
+                )
+                if options["format"] == "csv":
+                    chunks = csv_lines(rows, report_columns(report, options["by"]))
+                else:
+                    chunks = stream_json_array(rows, lambda row: row)
+                for chunk in chunks:
+                    out.write(chunk)
+            if options["format"] == "json":
+                out.write("\n")
+        finally:
+            if out is not sys.stdout:
+                out.close()
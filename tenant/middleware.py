@@ -0,0 +1,98 @@
+# tenant/middleware.py
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connection
+from django_tenants.middleware.main import TenantMainMiddleware
+
+from tenant.instrumentation import QueryRecorder, n_plus_one_threshold, tenant_metrics
+from tenant.resolver import resolve_hostname, to_tenant
+
+
+logger = logging.getLogger("tenant.instrumentation")
+
+
+class CachedTenantMiddleware(TenantMainMiddleware):
+    """
+    TenantMainMiddleware that resolves hostnames through tenant.resolver.
+
+    A cache hit costs no queries: set_schema_to_public() / set_tenant() only
+    mark the connection, search_path is applied on the next cursor.
+    """
+
+    def get_tenant(self, domain_model, hostname):
+        # raises domain_model.DoesNotExist, handled by the parent
+        return to_tenant(resolve_hostname(hostname, domain_model))
+
+
+class TenantMetricsMiddleware:
+    """
+    Records per-request tenant schema, query count, SQL time, serialization
+    time and response size into tenant.instrumentation.tenant_metrics.
+
+    Must come after CachedTenantMiddleware so request.tenant is set. Queries
+    run while a streaming response is consumed are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        self.record(request, response, recorder, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        # `connection` is per-thread: install the wrapper inside the sync hop,
+        # on the request's thread-sensitive executor where its ORM calls run
+        wrapper = await sync_to_async(install_execute_wrapper)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            elapsed = time.perf_counter() - start
+            await sync_to_async(wrapper.__exit__)(None, None, None)
+        await sync_to_async(self.record)(request, response, recorder, elapsed)
+        return response
+
+    def record(self, request, response, recorder, elapsed):
+        tenant = getattr(request, "tenant", None)
+        schema_name = tenant.schema_name if tenant is not None else connection.schema_name
+        serialization = request.__dict__.get("_metric_timings", {}).get("serialization")
+        repeated = recorder.repeated(n_plus_one_threshold())
+        for sql, times in repeated:
+            logger.warning(
+                "Possible N+1 on %s %s [%s]: %d x %s",
+                request.method, request.path, schema_name, times, sql,
+            )
+
+        tenant_metrics.record(
+            schema_name,
+            {
+                "latency_ms": elapsed * 1000,
+                "sql_ms": recorder.seconds * 1000,
+                "serialization_ms": serialization * 1000 if serialization is not None else None,
+                "queries": recorder.count,
+                "response_bytes": None if response.streaming else len(response.content),
+            },
+            n_plus_one=bool(repeated),
+        )
+
+
+def install_execute_wrapper(recorder):
+    """Enter connection.execute_wrapper(recorder) on this thread; caller exits it."""
+    wrapper = connection.execute_wrapper(recorder)
+    wrapper.__enter__()
+    return wrapper
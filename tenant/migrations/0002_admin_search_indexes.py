@@ -0,0 +1,24 @@
+# Generated by Django 5.1.15 on 2026-10-17 17:31
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0001_initial'),
+        ('tenant', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='domain',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('domain'), name='text_pattern_ops'), name='domain_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('slug'), name='text_pattern_ops'), name='tenant_slug_upper_idx'),
+        ),
+    ]
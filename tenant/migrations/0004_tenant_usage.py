@@ -0,0 +1,28 @@
+# Generated by Django 5.1.15 on 2026-10-17 17:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenant', '0003_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantUsage',
+            fields=[
+                ('tenant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='usage', serialize=False, to='tenant.tenant')),
+                ('members', models.IntegerField(default=0)),
+                ('tasks', models.BigIntegerField(default=0)),
+                ('storage_bytes', models.BigIntegerField(default=0)),
+                ('reconciled_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Tenant usage',
+                'verbose_name_plural': 'Tenant usage',
+            },
+        ),
+    ]
@@ -12,11 +12,14 @@
 #     pass
 
 
-from django.db import models
+from django.contrib.postgres.indexes import OpClass
+from django.db import models, transaction
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from subscriptions.models import SubscriptionPlan   # import plan
 from django_tenants.models import TenantMixin , DomainMixin 
+from django_tenants.utils import get_creation_fakes_migrations
 
 
 class BaseModel(models.Model):
@@ -73,31 +76,79 @@ class Tenant(TenantMixin, BaseModel):
         return self.plan is not None
 
     # -------- methods ----------
+    '''
+        mentality: the row change is saved now (routing and the resolver
+        cache depend on it).
+        - cached responses / permission sets built for the previous state are
+          dropped inline once the save commits: two cache writes, nothing a
+          worker needs to retry.
+        - real side effects (payment, quota work) are queued (tenant.jobs) in
+          the same transaction as the save and run by `manage.py run_jobs`.
+    '''
     def deactivate(self):
-        self.is_active = False
-        self.updated_at = timezone.now()
-        self.save()
-        return self
+        return self._set_active(False)
 
     def activate(self):
-        self.is_active = True
+        return self._set_active(True)
+
+    def _set_active(self, is_active):
+        from tenant.cache import tenant_cache
+        from users.permissions import bump_permissions_version
+
+        schema_name = self.schema_name
+
+        def drop_cached_state():
+            tenant_cache.bump(schema_name)
+            bump_permissions_version(schema_name)
+
+        self.is_active = is_active
         self.updated_at = timezone.now()
-        self.save()
+        with transaction.atomic():
+            self.save(update_fields=["is_active", "updated_at"])
+            transaction.on_commit(drop_cached_state)
         return self
 
     def attach_free_plan(self):
-        self.plan = SubscriptionPlan.objects.get(code="free")
-        self.save()
-        return self 
+        return self.attach_plan(SubscriptionPlan.objects.get(code="free"))
     
     def attach_plan(self, plan):
         """Attach or change subscription plan"""
+        from tenant.cache import tenant_cache
+        from tenant.jobs import PLAN_CHANGED, enqueue
+
+        schema_name = self.schema_name
+        previous_plan_id = self.plan_id
         self.plan = plan
         self.updated_at = timezone.now()
-        # go to payment function 
-        self.save()
+        with transaction.atomic():
+            self.save(update_fields=["plan", "updated_at"])
+            tenant_cache.bump_on_commit(schema_name)
+            # payment / quota work runs on the job worker
+            enqueue(
+                PLAN_CHANGED,
+                tenant=self,
+                payload={"plan_id": self.plan_id, "previous_plan_id": previous_plan_id},
+            )
         return self
 
+    def create_schema(self, check_if_exists=False, sync_schema=True, verbosity=1):
+        # cloning fakes every migration: refuse a template that is behind
+        if sync_schema and get_creation_fakes_migrations():
+            from tenant.provisioning import check_template_schema
+
+            check_template_schema()
+        return super().create_schema(check_if_exists, sync_schema, verbosity)
+
+    def create_schema_later(self):
+        """Save a new tenant now and create + migrate its schema on the job worker."""
+        from tenant.jobs import CREATE_SCHEMA, enqueue
+
+        self.auto_create_schema = False
+        with transaction.atomic():
+            self.save()
+            job = enqueue(CREATE_SCHEMA, tenant=self)
+        return job
+
     # -------- Meta ----------
     class Meta:
         ordering = ["-created_at"]
@@ -105,6 +156,8 @@ class Tenant(TenantMixin, BaseModel):
         verbose_name_plural = "Tenants"
         indexes = [
             models.Index(fields=["is_active"]),
+            # admin search "^slug" -> UPPER(slug) LIKE 'X%'
+            models.Index(OpClass(Upper("slug"), name="text_pattern_ops"), name="tenant_slug_upper_idx"),
         ]
 
     def __str__(self):
@@ -121,6 +174,95 @@ class Domain(DomainMixin, BaseModel):
         if not self.domain:
             raise ValidationError({"domain": "Domain cannot be empty"})
 
+    class Meta:
+        indexes = [
+            # admin search "^domain" -> UPPER(domain) LIKE 'X%'
+            models.Index(OpClass(Upper("domain"), name="text_pattern_ops"), name="domain_upper_idx"),
+        ]
+
     def __str__(self):
         return f"{self.domain} ({'primary' if self.is_primary else 'secondary'})"
-    
\ No newline at end of file
+    
+
+class Job(BaseModel):
+    """
+    One unit of background work, run by `manage.py run_jobs` (tenant.jobs).
+
+    Lives in the public schema; handlers switch to the tenant's schema
+    themselves when they need it.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    name = models.CharField(max_length=100)
+    tenant = models.ForeignKey(
+        Tenant,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="jobs",
+    )
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    # -------- Meta ----------
+    class Meta:
+        ordering = ["run_after", "id"]
+        indexes = [
+            # the worker's claim query: pending jobs that are due, oldest first
+            models.Index(
+                fields=["run_after", "id"],
+                condition=models.Q(status="pending"),
+                name="job_pending_idx",
+            ),
+            # stale lock recovery
+            models.Index(
+                fields=["locked_at"],
+                condition=models.Q(status="running"),
+                name="job_running_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+class TenantUsage(models.Model):
+    """
+    Denormalized usage counters of one tenant, kept by tenant.usage.
+
+    Updated with F() expressions as members and tasks change, so quota
+    checks read one row instead of counting; `manage.py reconcile_usage`
+    recounts them from the real tables.
+    """
+
+    tenant = models.OneToOneField(
+        Tenant,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="usage",
+    )
+    # not Positive*: a drifted counter must not make a delete fail, the
+    # reconciliation fixes it
+    members = models.IntegerField(default=0)
+    tasks = models.BigIntegerField(default=0)
+    storage_bytes = models.BigIntegerField(default=0)
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Tenant usage"
+        verbose_name_plural = "Tenant usage"
+
+    def __str__(self):
+        return f"{self.tenant_id}: {self.members} members, {self.tasks} tasks"
@@ -0,0 +1,82 @@
+# tenant/postgresql_backend/base.py
+import django.db.utils
+from django.core.exceptions import ImproperlyConfigured
+from django_tenants.postgresql_backend.base import (
+    DatabaseWrapper as TenantDatabaseWrapper,
+    is_psycopg3,
+    psycopg,
+)
+
+
+'''
+    mentality: keep the search_path of a persistent connection in step with
+    connection.schema_name without re-sending it on every cursor.
+    - django_tenants runs SET search_path on each cursor (or, with
+      TENANT_LIMIT_SET_CALLS, once per set_tenant() - which the middleware
+      calls on every request).
+    - with the connection pool (or CONN_MAX_AGE) the session outlives the
+      request, so we remember the search_path actually applied on the live
+      session and only SET it when the wanted one differs.
+    - the remembered value is dropped whenever the session may have lost it
+      or another tenant may have changed it: new connection or pool checkout
+      (both go through get_new_connection), close, and rollback (a SET issued
+      inside a transaction is undone by ROLLBACK / ROLLBACK TO SAVEPOINT).
+    - needs session-level pooling; a transaction-mode pooler (pgbouncer
+      pool_mode=transaction) hands out a different session per transaction.
+'''
+class DatabaseWrapper(TenantDatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        self.applied_search_path = None
+        super().__init__(*args, **kwargs)
+
+    def get_new_connection(self, conn_params):
+        self.applied_search_path = None
+        return super().get_new_connection(conn_params)
+
+    def close(self):
+        self.applied_search_path = None
+        super().close()
+
+    def _rollback(self):
+        self.applied_search_path = None
+        return super()._rollback()
+
+    def _savepoint_rollback(self, sid):
+        self.applied_search_path = None
+        return super()._savepoint_rollback(sid)
+
+    def _cursor(self, name=None):
+        # skip django_tenants' _cursor(), this one replaces it
+        if name:
+            cursor = super(TenantDatabaseWrapper, self)._cursor(name=name)
+        else:
+            cursor = super(TenantDatabaseWrapper, self)._cursor()
+
+        if not self.schema_name:
+            raise ImproperlyConfigured("Database schema not set. Did you forget "
+                                       "to call set_schema() or set_tenant()?")
+
+        search_paths = tuple(self._get_cursor_search_paths())
+        if search_paths == self.applied_search_path:
+            self.search_path_set_schemas = list(search_paths)
+            return cursor
+
+        if name or is_psycopg3:
+            # named cursors are single use, see django_tenants
+            cursor_for_search_path = self.connection.cursor()
+        else:
+            cursor_for_search_path = cursor
+
+        try:
+            formatted = ",".join("'{}'".format(s) for s in search_paths)
+            cursor_for_search_path.execute("SET search_path = {0}".format(formatted))
+        except (django.db.utils.DatabaseError, psycopg.InternalError):
+            # aborted transaction: the next statement fails too, or it is a rollback
+            self.applied_search_path = None
+            self.search_path_set_schemas = None
+        else:
+            self.applied_search_path = search_paths
+            self.search_path_set_schemas = list(search_paths)
+        if name or is_psycopg3:
+            cursor_for_search_path.close()
+        return cursor
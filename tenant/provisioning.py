@@ -0,0 +1,144 @@
+# tenant/provisioning.py
+import time
+
+
+'''
+    mentality: schema creation/migration is the slow part of onboarding a
+    tenant, and each schema is independent, so run them on a process pool.
+    - everything here runs inside pool workers: keep imports lazy so the
+      module can be loaded before django.setup().
+    - the parent must close its DB connections, and its connection pool,
+      before starting the pool so forked workers never share a socket with
+      it (close_connections()).
+'''
+class StaleTemplateError(Exception):
+    """The template schema is missing migrations, cloning it would fake them."""
+
+
+def init_worker():
+    import django
+
+    django.setup()
+
+
+def create_schema(schema_name):
+    """
+    Create and migrate the schema of an existing Tenant row.
+
+    Returns (schema_name, created, seconds). Mirrors what Tenant.save() does
+    for a new tenant, minus the row insert.
+    """
+    from django.db import connection
+    from django_tenants.models import TenantMixin
+    from django_tenants.signals import post_schema_sync
+    from tenant.models import Tenant
+
+    start = time.perf_counter()
+    tenant = Tenant.objects.get(schema_name=schema_name)
+    created = tenant.create_schema(check_if_exists=True, verbosity=0) is not False
+    if created:
+        post_schema_sync.send(sender=TenantMixin, tenant=tenant.serializable_fields())
+    connection.close()
+    return schema_name, created, time.perf_counter() - start
+
+
+def close_connections():
+    """Close every DB connection and connection pool of this process."""
+    from django.db import connections
+
+    for conn in connections.all():
+        conn.close()
+        # a pooled connection is only handed back by close(), the pool keeps it open
+        close_pool = getattr(conn, "close_pool", None)
+        if close_pool is not None:
+            close_pool()
+
+
+def run_in_pool(func, items, workers, on_result=None):
+    """
+    Run ``func(item)`` for every item on ``workers`` processes.
+
+    ``on_result(item, result, error)`` is called in the parent as each item
+    finishes. Returns the list of (item, exception) failures.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    close_connections()
+    failures = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        futures = {pool.submit(func, item): item for item in items}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                result, error = future.result(), None
+            except Exception as exc:
+                result, error = None, exc
+                failures.append((item, exc))
+            if on_result:
+                on_result(item, result, error)
+    return failures
+
+
+def ensure_template_schema(verbosity=1):
+    """
+    Create (if missing) and migrate the TENANT_BASE_SCHEMA template.
+
+    With TENANT_CREATION_FAKES_MIGRATIONS on, Tenant.create_schema() clones
+    this schema and fakes the migrations instead of replaying them, so it
+    must be migrated before any new tenant is provisioned.
+
+    Also (re)creates the clone_schema() SQL function here, once, before any
+    pool starts: CloneSchema creates it lazily, and workers racing to do so
+    fail with "tuple concurrently updated".
+    """
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+    from django_tenants.clone import CloneSchema
+    from django_tenants.utils import schema_exists
+
+    schema_name = settings.TENANT_BASE_SCHEMA
+    created = not schema_exists(schema_name)
+    if created:
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE SCHEMA {connection.ops.quote_name(schema_name)}")
+
+    call_command(
+        "migrate_schemas",
+        tenant=True,
+        schema_name=schema_name,
+        interactive=False,
+        verbosity=verbosity,
+    )
+    connection.set_schema_to_public()
+    CloneSchema()._create_clone_schema_function()
+    return created
+
+
+def unapplied_template_migrations():
+    """(app_label, name) of every migration not yet applied to the template."""
+    from django.conf import settings
+    from django.db import connection
+    from django.db.migrations.executor import MigrationExecutor
+    from django_tenants.utils import schema_context, schema_exists
+
+    schema_name = settings.TENANT_BASE_SCHEMA
+    if not schema_exists(schema_name):
+        raise StaleTemplateError(f"template schema '{schema_name}' does not exist")
+    with schema_context(schema_name):
+        executor = MigrationExecutor(connection)
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    return [(migration.app_label, migration.name) for migration, _ in plan]
+
+
+def check_template_schema():
+    """Raise StaleTemplateError unless the template is fully migrated."""
+    from django.conf import settings
+
+    pending = unapplied_template_migrations()
+    if pending:
+        names = ", ".join(f"{app}.{name}" for app, name in pending)
+        raise StaleTemplateError(
+            f"template schema '{settings.TENANT_BASE_SCHEMA}' has unapplied "
+            f"migrations ({names}); run `manage.py migrate_tenants --template-only`"
+        )
@@ -0,0 +1,173 @@
+# tenant/reporting.py
+import csv
+from collections import namedtuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django_tenants.postgresql_backend.base import _check_schema_name
+from django_tenants.utils import get_public_schema_name, get_tenant_model
+
+
+DEFAULT_BATCH_SIZE = 100
+
+
+'''
+    mentality: platform reports in one query per batch of schemas instead of
+    one schema_context() round trip per tenant.
+    - every tenant schema has the same tables, so the per-schema aggregates
+      are glued together with UNION ALL, each branch tagged with its tenant id.
+    - the union is joined with the public Tenant / SubscriptionPlan tables in
+      the same statement, rows come back ready to write.
+    - only schemas that actually have the table are queried (one pg_class
+      lookup), so a tenant that is still migrating doesn't break the report.
+'''
+Report = namedtuple("Report", ["model", "columns", "expressions", "description"])
+
+REPORTS = {
+    "tasks": Report(
+        model="todo.Task",
+        columns=("tasks", "open_tasks", "completed_tasks", "overdue_tasks"),
+        expressions=(
+            "count(*)",
+            "count(*) FILTER (WHERE NOT completed)",
+            "count(*) FILTER (WHERE completed)",
+            "count(*) FILTER (WHERE published_at IS NOT NULL AND NOT completed)",
+        ),
+        description="Task counts per tenant",
+    ),
+    "members": Report(
+        model="permissions.UserTenantPermissions",
+        columns=("members", "staff_members"),
+        expressions=("count(*)", "count(*) FILTER (WHERE is_staff)"),
+        description="Tenant memberships per tenant",
+    ),
+    "storage": Report(
+        model="todo.Task",
+        columns=("tasks", "storage_bytes"),
+        # same measure as tenant.usage.task_size()
+        expressions=("count(*)", "coalesce(sum(octet_length(title) + octet_length(description)), 0)"),
+        description="Task count and stored task bytes per tenant",
+    ),
+}
+
+TENANT_COLUMNS = ("tenant_id", "schema_name", "tenant", "plan")
+
+
+def get_report(name):
+    try:
+        return REPORTS[name]
+    except KeyError:
+        raise ValueError(f"unknown report {name!r}, expected one of {sorted(REPORTS)}")
+
+
+def report_columns(report, by="tenant"):
+    if by == "plan":
+        return ("plan", "tenants") + report.columns
+    return TENANT_COLUMNS + report.columns
+
+
+def run_report(report, batch_size=None, active_only=False, by="tenant"):
+    """
+    Yield one dict per tenant (or per plan with ``by="plan"``).
+
+    Tenant rows are yielded batch by batch as the queries return; plan rows
+    can only be summed once every batch is in.
+    """
+    if by not in ("tenant", "plan"):
+        raise ValueError("by must be tenant or plan")
+    rows = _tenant_rows(report, batch_size or _batch_size(), active_only)
+    if by == "plan":
+        return iter(by_plan(rows, report))
+    return rows
+
+
+def by_plan(rows, report):
+    totals = {}
+    for row in rows:
+        plan = totals.setdefault(row["plan"], dict.fromkeys(("tenants",) + report.columns, 0))
+        plan["tenants"] += 1
+        for column in report.columns:
+            plan[column] += row[column]
+    return [{"plan": plan, **values} for plan, values in sorted(totals.items(), key=lambda i: i[0] or "")]
+
+
+def _tenant_rows(report, batch_size, active_only):
+    model = apps.get_model(report.model)
+    tenants = report_tenants(model._meta.db_table, active_only)
+    columns = TENANT_COLUMNS + report.columns
+    with connection.cursor() as cursor:
+        for start in range(0, len(tenants), batch_size):
+            sql, params = batch_sql(report, model, tenants[start:start + batch_size])
+            cursor.execute(sql, params)
+            for values in cursor.fetchall():
+                yield dict(zip(columns, values))
+
+
+def batch_sql(report, model, tenants):
+    """One UNION ALL over ``tenants`` ((id, schema_name) pairs) joined with Tenant.plan."""
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    selects = ", ".join(
+        f"{expression} AS {qn(column)}"
+        for column, expression in zip(report.columns, report.expressions)
+    )
+    branches, params = [], []
+    for tenant_id, schema_name in tenants:
+        _check_schema_name(schema_name)
+        branches.append(f"SELECT %s AS tenant_id, {selects} FROM {qn(schema_name)}.{table}")
+        params.append(tenant_id)
+
+    tenant_model = get_tenant_model()
+    plan_model = tenant_model._meta.get_field("plan").related_model
+    public = qn(get_public_schema_name())
+    report_columns = ", ".join(f"r.{qn(column)}" for column in report.columns)
+    sql = (
+        f"SELECT t.id, t.schema_name, t.name, p.code, {report_columns} "
+        f"FROM ({' UNION ALL '.join(branches)}) r "
+        f"JOIN {public}.{qn(tenant_model._meta.db_table)} t ON t.id = r.tenant_id "
+        f"LEFT JOIN {public}.{qn(plan_model._meta.db_table)} p ON p.id = t.plan_id "
+        f"ORDER BY t.id"
+    )
+    return sql, params
+
+
+def report_tenants(table, active_only):
+    schemas = schemas_with_table(table)
+    tenants = get_tenant_model().objects.exclude(schema_name=get_public_schema_name())
+    if active_only:
+        tenants = tenants.filter(is_active=True)
+    return [
+        (pk, schema_name)
+        for pk, schema_name in tenants.order_by("id").values_list("id", "schema_name")
+        if schema_name in schemas
+    ]
+
+
+def schemas_with_table(table):
+    # the template schema has the tables too, but no Tenant row
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT n.nspname FROM pg_class c "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relname = %s AND c.relkind IN ('r', 'p')",
+            [table],
+        )
+        return {name for (name,) in cursor.fetchall()}
+
+
+def _batch_size():
+    return getattr(settings, "TENANT_REPORT_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows, columns):
+    """Yield CSV lines (header first) for dict ``rows``."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([row[column] for column in columns])
@@ -0,0 +1,115 @@
+# tenant/resolver.py
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django_tenants.utils import get_tenant_domain_model
+
+
+'''
+    mentality: hostname -> tenant lookups are hot and almost never change.
+    - keep a small process-local LRU of tenant snapshots with a TTL.
+    - signals on Tenant / Domain drop entries in this process; the TTL bounds
+      how long other processes can serve a stale snapshot.
+'''
+TenantSnapshot = namedtuple(
+    "TenantSnapshot",
+    ["id", "schema_name", "name", "slug", "is_active", "plan_id"],
+)
+
+
+class LRUCache:
+    """Thread-safe LRU mapping whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard_where(self, predicate):
+        with self._lock:
+            for key in [k for k, (v, _) in self._data.items() if predicate(k, v)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+tenant_cache = LRUCache(
+    maxsize=getattr(settings, "TENANT_RESOLUTION_CACHE_SIZE", 1024),
+    ttl=getattr(settings, "TENANT_RESOLUTION_CACHE_TTL", 60),
+)
+
+
+def snapshot(tenant):
+    return TenantSnapshot(
+        id=tenant.id,
+        schema_name=tenant.schema_name,
+        name=tenant.name,
+        slug=tenant.slug,
+        is_active=tenant.is_active,
+        plan_id=tenant.plan_id,
+    )
+
+
+def to_tenant(tenant_snapshot):
+    """Rebuild a Tenant instance from a snapshot without touching the DB."""
+    from tenant.models import Tenant
+
+    # from_db() marks the instance as loaded; fields outside the snapshot are
+    # deferred and only fetched if something actually reads them
+    return Tenant.from_db(
+        "default",
+        list(TenantSnapshot._fields),
+        list(tenant_snapshot),
+    )
+
+
+def resolve_hostname(hostname, domain_model=None):
+    """
+    Snapshot of the tenant serving ``hostname``, from the cache when possible.
+
+    Raises ``domain_model.DoesNotExist`` for unknown hostnames. The query runs
+    on whatever schema the connection is set to, callers switch to public first.
+    """
+    cached = tenant_cache.get(hostname)
+    if cached is None:
+        if domain_model is None:
+            domain_model = get_tenant_domain_model()
+        domain = domain_model.objects.select_related("tenant").get(domain=hostname)
+        cached = snapshot(domain.tenant)
+        tenant_cache.set(hostname, cached)
+    return cached
+
+
+def invalidate_hostname(hostname):
+    tenant_cache.discard_where(lambda key, value: key == hostname)
+
+
+def invalidate_tenant(tenant_id):
+    tenant_cache.discard_where(lambda key, value: value.id == tenant_id)
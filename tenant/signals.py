@@ -0,0 +1,26 @@
+# tenant/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from tenant.models import Domain, Tenant, TenantUsage
+from tenant.resolver import invalidate_hostname, invalidate_tenant
+
+
+# Tenant.activate / deactivate / attach_plan / attach_free_plan all go
+# through save(), so post_save covers them.
+@receiver([post_save, post_delete], sender=Tenant)
+def drop_cached_tenant(sender, instance, **kwargs):
+    invalidate_tenant(instance.id)
+
+
+@receiver(post_save, sender=Tenant)
+def create_usage_counters(sender, instance, created, **kwargs):
+    if created:
+        TenantUsage.objects.get_or_create(tenant=instance)
+
+
+@receiver([post_save, post_delete], sender=Domain)
+def drop_cached_domain(sender, instance, **kwargs):
+    # the domain may have been renamed or moved to another tenant
+    invalidate_hostname(instance.domain)
+    invalidate_tenant(instance.tenant_id)
@@ -0,0 +1,199 @@
+from datetime import timedelta
+
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+from django_tenants.test.cases import TenantTestCase
+
+from subscriptions.models import SubscriptionPlan
+from subscriptions.utils.entitlements import entitlements
+from subscriptions.utils.plan import PlanCode
+from todo.models import Task
+from users.models import CustomUser
+
+from .instrumentation import Histogram, QueryRecorder
+from .jobs import claim_jobs, enqueue, job_handler, release_stale_jobs, run_job
+from .models import Job, TenantUsage
+from .usage import QuotaExceeded, reconcile_tenants, reserve_members, task_size
+
+
+class HistogramTests(SimpleTestCase):
+    def histogram(self, *values):
+        histogram = Histogram((1, 10, 100))
+        for value in values:
+            histogram.observe(value)
+        return histogram
+
+    def test_empty(self):
+        self.assertIsNone(self.histogram().quantile(0.5))
+
+    def test_quantile_is_the_bucket_bound(self):
+        histogram = self.histogram(0.5, 5, 5, 50)
+        self.assertEqual(histogram.quantile(0.25), 1)
+        self.assertEqual(histogram.quantile(0.5), 10)
+        self.assertEqual(histogram.quantile(0.99), 100)
+
+    def test_bounds_are_inclusive(self):
+        self.assertEqual(self.histogram(10).quantile(0.5), 10)
+
+    def test_overflow_bucket(self):
+        histogram = self.histogram(5, 1000)
+        self.assertEqual(histogram.quantile(0.5), 10)
+        self.assertIsNone(histogram.quantile(0.99))
+
+    def test_as_dict(self):
+        data = self.histogram(0.5, 5, 1000).as_dict()
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(data["sum"], 1005.5)
+        self.assertEqual(data["buckets"], {"le_1": 1, "le_10": 1, "le_100": 0, "inf": 1})
+
+
+class QueryRecorderTests(SimpleTestCase):
+    def test_counts_repeated_statements(self):
+        recorder = QueryRecorder()
+        execute = lambda sql, params, many, context: None
+        for sql in ("SELECT 1", "SELECT 2", "SELECT 1", "SELECT 1"):
+            recorder(execute, sql, (), False, {})
+        self.assertEqual(recorder.count, 4)
+        self.assertEqual(recorder.repeated(3), [("SELECT 1", 3)])
+        self.assertEqual(recorder.repeated(4), [])
+
+
+#----------database tests------------
+RUNS = []
+
+
+@job_handler("tests.record")
+def record_job(job):
+    RUNS.append(job.payload)
+
+
+@job_handler("tests.fail")
+def failing_job(job):
+    raise RuntimeError("boom")
+
+
+class TenantDBTestCase(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = "Test tenant"
+        tenant.slug = "test"
+
+
+class JobQueueTests(TenantDBTestCase):
+    def setUp(self):
+        RUNS.clear()
+
+    def claim_one(self, name, **kwargs):
+        job = enqueue(name, **kwargs)
+        [claimed] = claim_jobs(1, worker="worker-1")
+        self.assertEqual(claimed.id, job.id)
+        return claimed
+
+    def test_unknown_handler(self):
+        with self.assertRaises(ValueError):
+            enqueue("tests.missing")
+
+    def test_claim_takes_due_jobs_once(self):
+        due = enqueue("tests.record")
+        enqueue("tests.record", delay=3600)
+        self.assertEqual([job.id for job in claim_jobs(10, worker="worker-1")], [due.id])
+        self.assertEqual(claim_jobs(10, worker="worker-2"), [])
+        due.refresh_from_db()
+        self.assertEqual(
+            (due.status, due.attempts, due.locked_by),
+            (Job.Status.RUNNING, 1, "worker-1"),
+        )
+
+    def test_run_success(self):
+        job = self.claim_one("tests.record", payload={"n": 1})
+        self.assertTrue(run_job(job))
+        job.refresh_from_db()
+        self.assertEqual(RUNS, [{"n": 1}])
+        self.assertEqual(job.status, Job.Status.DONE)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failure_is_retried_with_backoff(self):
+        job = self.claim_one("tests.fail", max_attempts=2)
+        self.assertFalse(run_job(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn("boom", job.last_error)
+
+    def test_last_attempt_fails(self):
+        job = self.claim_one("tests.fail", max_attempts=1)
+        self.assertFalse(run_job(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+
+    def test_outcome_needs_the_lock(self):
+        job = self.claim_one("tests.record")
+        Job.objects.filter(id=job.id).update(locked_by="worker-2")
+        run_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.Status.RUNNING, "worker-2"))
+
+    @override_settings(JOB_LOCK_TIMEOUT=600)
+    def test_release_stale_jobs(self):
+        retry = self.claim_one("tests.record")
+        last = self.claim_one("tests.record", max_attempts=1)
+        fresh = self.claim_one("tests.record")
+        Job.objects.filter(id__in=[retry.id, last.id]).update(
+            locked_at=timezone.now() - timedelta(seconds=601),
+        )
+        self.assertEqual(release_stale_jobs(), 1)
+        statuses = dict(Job.objects.values_list("id", "status"))
+        self.assertEqual(statuses[retry.id], Job.Status.PENDING)
+        self.assertEqual(statuses[last.id], Job.Status.FAILED)
+        self.assertEqual(statuses[fresh.id], Job.Status.RUNNING)
+
+
+class TenantUsageTests(TenantDBTestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create(email="owner@example.com")
+        entitlements.clear_local()
+
+    def counters(self):
+        usage = TenantUsage.objects.get(tenant=self.tenant)
+        return usage.members, usage.tasks, usage.storage_bytes
+
+    def make_task(self, description):
+        return Task.objects.create(user=self.user, title="title", description=description)
+
+    def test_task_counters(self):
+        task = self.make_task("first task")
+        self.assertEqual(self.counters(), (0, 1, task_size("title", "first task")))
+        task.description = "a longer description"
+        task.save()
+        self.assertEqual(self.counters(), (0, 1, task_size("title", "a longer description")))
+        task.delete()
+        self.assertEqual(self.counters(), (0, 0, 0))
+
+    def test_bulk_create_counts(self):
+        Task.objects.bulk_create([
+            Task(user=self.user, title="title", description=description)
+            for description in ("first task", "second task")
+        ])
+        self.assertEqual(
+            self.counters(),
+            (0, 2, task_size("title", "first task") + task_size("title", "second task")),
+        )
+
+    def test_member_limit(self):
+        self.tenant.plan = SubscriptionPlan.objects.create(
+            code=PlanCode.FREE, max_users=2, storage_gb_per_user=1,
+        )
+        reserve_members(self.tenant)
+        reserve_members(self.tenant)
+        with self.assertRaises(QuotaExceeded):
+            reserve_members(self.tenant)
+        self.assertEqual(self.counters()[0], 2)
+
+    def test_reconcile_fixes_drift(self):
+        task = self.make_task("first task")
+        TenantUsage.objects.filter(tenant=self.tenant).update(members=5, tasks=99)
+        drift = reconcile_tenants([self.tenant])
+        real = (0, 1, task.stored_size)
+        self.assertEqual(drift, {self.tenant.id: ((5, 99, task.stored_size), real)})
+        self.assertEqual(self.counters(), real)
+        self.assertEqual(reconcile_tenants([self.tenant]), {})
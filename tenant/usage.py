@@ -0,0 +1,184 @@
+# tenant/usage.py
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+from django_tenants.utils import get_public_schema_name
+
+from subscriptions.utils.entitlements import limit
+
+
+GB = 1024 ** 3
+
+
+'''
+    mentality: quota checks read counters instead of counting rows.
+    - TenantUsage holds members / tasks / storage_bytes per tenant, moved
+      with F() updates by the membership and Task signals (and the
+      TaskQuerySet bulk paths).
+    - adding a member is a conditional increment,
+          UPDATE ... SET members = members + n WHERE members <= max_users - n
+      one row lock, so concurrent signups can't both take the last seat.
+      It runs in pre_add, inside the m2m add transaction: if the add fails
+      the increment rolls back with it.
+    - storage is checked against the counter (storage_gb_per_user x members)
+      before bulk task creation; it is a soft limit.
+    - counters can drift (raw SQL, queryset.update of text, ignore_conflicts);
+      `manage.py reconcile_usage` recounts them.
+'''
+class QuotaExceeded(ValidationError):
+    pass
+
+
+def task_size(title, description):
+    # same measure as the "storage" report: octet_length(title) + octet_length(description)
+    return len((title or "").encode("utf-8")) + len((description or "").encode("utf-8"))
+
+
+def member_limit(tenant):
+    """max_users of the tenant's plan; None (unlimited) for public and plan-less tenants."""
+    if tenant.schema_name == get_public_schema_name() or tenant.plan_id is None:
+        return None
+    return limit(tenant, "max_users")
+
+
+#----------members------------
+def reserve_members(tenant, count=1):
+    """Count ``count`` new members of ``tenant``, or raise QuotaExceeded."""
+    from tenant.models import TenantUsage
+
+    max_users = member_limit(tenant)
+    usage = TenantUsage.objects.filter(tenant_id=tenant.id)
+    if max_users is None:
+        if not usage.update(members=F("members") + count):
+            reconcile_tenants([tenant])
+            usage.update(members=F("members") + count)
+        return
+
+    for _ in range(2):
+        if usage.filter(members__lte=max_users - count).update(members=F("members") + count):
+            return
+        if usage.exists():
+            break
+        # no counter yet (tenant created in bulk): count once, then retry
+        reconcile_tenants([tenant])
+    raise QuotaExceeded(
+        f"{tenant.name} has reached its plan limit of {max_users} users",
+        code="max_users",
+    )
+
+
+def release_members(counts):
+    """``counts``: {tenant_id: members removed}."""
+    from tenant.models import TenantUsage
+
+    for tenant_id, count in counts.items():
+        if count:
+            TenantUsage.objects.filter(tenant_id=tenant_id).update(members=F("members") - count)
+
+
+#----------tasks / storage------------
+def add_task_usage(tasks=0, storage_bytes=0, schema_name=None):
+    """Move the task counters of the current (or given) tenant schema."""
+    from tenant.models import TenantUsage
+
+    if not tasks and not storage_bytes:
+        return
+    schema_name = schema_name or connection.schema_name
+    TenantUsage.objects.filter(tenant__schema_name=schema_name).update(
+        tasks=F("tasks") + tasks,
+        storage_bytes=F("storage_bytes") + storage_bytes,
+    )
+
+
+def check_storage(extra_bytes, schema_name=None):
+    """Raise QuotaExceeded if ``extra_bytes`` more would exceed the tenant's storage."""
+    from tenant.models import TenantUsage
+
+    schema_name = schema_name or connection.schema_name
+    usage = (
+        TenantUsage.objects.select_related("tenant")
+        .filter(tenant__schema_name=schema_name)
+        .first()
+    )
+    if usage is None or usage.tenant.plan_id is None:
+        return
+    allowed = limit(usage.tenant, "storage_gb_per_user") * max(usage.members, 1) * GB
+    if usage.storage_bytes + extra_bytes > allowed:
+        raise QuotaExceeded(
+            f"{usage.tenant.name} has reached its storage limit",
+            code="storage_gb_per_user",
+        )
+
+
+#----------reconciliation------------
+def reconcile_tenants(tenants):
+    """
+    Recount the usage of ``tenants`` (Tenant instances) from the real tables.
+
+    Returns {tenant_id: (old, new)} of the counters that had drifted, as
+    (members, tasks, storage_bytes) tuples.
+
+    The counter rows are locked before counting: a concurrent change either
+    committed before (and is in the count) or waits for the lock and is
+    applied on top of the recount, so nothing is lost or counted twice.
+    """
+    from django.apps import apps
+
+    from tenant.models import TenantUsage
+    from tenant.reporting import REPORTS, batch_sql, schemas_with_table
+    from users.models import CustomUser
+
+    tenants = list(tenants)
+    if not tenants:
+        return {}
+    ids = [tenant.id for tenant in tenants]
+    report = REPORTS["storage"]
+    task_model = apps.get_model(report.model)
+
+    with transaction.atomic():
+        TenantUsage.objects.bulk_create(
+            [TenantUsage(tenant_id=pk) for pk in ids],
+            ignore_conflicts=True,
+        )
+        usages = {
+            usage.tenant_id: usage
+            for usage in TenantUsage.objects.select_for_update().filter(tenant_id__in=ids)
+        }
+
+        members = dict(
+            CustomUser.tenants.through.objects.filter(tenant_id__in=ids)
+            .order_by()
+            .values("tenant_id")
+            .annotate(count=Count("id"))
+            .values_list("tenant_id", "count")
+        )
+        tasks = {}
+        # tenants whose schema isn't built yet have no tasks
+        schemas = schemas_with_table(task_model._meta.db_table)
+        with_tasks = [
+            (t.id, t.schema_name) for t in tenants
+            if t.schema_name != get_public_schema_name() and t.schema_name in schemas
+        ]
+        if with_tasks:
+            sql, params = batch_sql(report, task_model, with_tasks)
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                for tenant_id, _schema, _name, _plan, count, storage_bytes in cursor.fetchall():
+                    tasks[tenant_id] = (count, storage_bytes)
+
+        now = timezone.now()
+        drift = {}
+        for tenant_id, usage in usages.items():
+            old = (usage.members, usage.tasks, usage.storage_bytes)
+            usage.members = members.get(tenant_id, 0)
+            usage.tasks, usage.storage_bytes = tasks.get(tenant_id, (0, 0))
+            usage.reconciled_at = now
+            new = (usage.members, usage.tasks, usage.storage_bytes)
+            if old != new:
+                drift[tenant_id] = (old, new)
+        TenantUsage.objects.bulk_update(
+            list(usages.values()),
+            ["members", "tasks", "storage_bytes", "reconciled_at"],
+        )
+    return drift
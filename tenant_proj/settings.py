@@ -16,7 +16,7 @@ ALLOWED_HOSTS = []
 
 SHARED_APPS = [
     'django_tenants',  
-    'rest_framework',
+    # 'rest_framework',  # unused so far; its system checks add ~100 modules to every manage.py run
     
     'django.contrib.admin',
     'django.contrib.auth',
@@ -56,6 +56,25 @@ TENANT_DOMAIN_MODEL = "tenant.Domain"
 PUBLIC_SCHEMA_NAME = "public"
 BASE_DOMAIN = "localhost"
 
+# hostname -> tenant cache used by tenant.middleware.CachedTenantMiddleware
+TENANT_RESOLUTION_CACHE_SIZE = 1024
+TENANT_RESOLUTION_CACHE_TTL = 60  # seconds
+
+# how often each process compares its plan table with the shared version
+# (subscriptions.utils.entitlements)
+ENTITLEMENTS_VERSION_CHECK_INTERVAL = 5  # seconds
+
+# With TENANT_CLONE_TEMPLATE=1, new tenant schemas are cloned from this
+# template and their migrations faked instead of replayed. Only
+# `manage.py migrate_tenants` migrates the template, so enable it only where
+# deploys run that command; Tenant.create_schema() refuses a stale template.
+TENANT_BASE_SCHEMA = "tenant_template"
+TENANT_CREATION_FAKES_MIGRATIONS = config("TENANT_CLONE_TEMPLATE", default=False, cast=bool)
+
+# `migrate_schemas --executor=multiprocessing` / `migrate_tenants --workers`
+TENANT_MULTIPROCESSING_MAX_PROCESSES = config("TENANT_MIGRATION_WORKERS", default=4, cast=int)
+TENANT_MULTIPROCESSING_CHUNKS = 2
+
 # This is your default URL config (tenant-aware)
 ROOT_URLCONF = "tenant_proj.urls"
 
@@ -65,17 +84,25 @@ PUBLIC_SCHEMA_URLCONF = "tenant_proj.urls_public"
 # django-tenant-users 
 TENANT_USERS_DOMAIN = BASE_DOMAIN
 AUTHENTICATION_BACKENDS = [
-    "tenant_users.permissions.backend.UserBackend",
+    "users.backends.CachedUserBackend",   # tenant_users UserBackend + permission cache
 ] 
 
+# users.permissions: per-(tenant, user) permission cache
+TENANT_PERMISSION_CACHE_SIZE = 10000
+TENANT_PERMISSION_CACHE_TTL = 300  # seconds
+# how long each process trusts its copy of a schema's permission version
+TENANT_PERMISSION_VERSION_TTL = 1  # seconds
+
 '''----------------------------------'''
 
 MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',           # first: its headers/redirect cover the cached home page too
+    "home.middleware.CachedHomePageMiddleware",                # anonymous public home page, before sessions/tenant
     'django.contrib.sessions.middleware.SessionMiddleware',
     "django.contrib.auth.middleware.AuthenticationMiddleware", # django-tenant-users
-    "django_tenants.middleware.main.TenantMainMiddleware",     # must be here 
+    "tenant.middleware.CachedTenantMiddleware",                # TenantMainMiddleware + hostname cache, must be here 
+    "tenant.middleware.TenantMetricsMiddleware",               # per-tenant query/latency metrics, after the tenant is set
 
-    'django.middleware.security.SecurityMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -113,17 +140,55 @@ WSGI_APPLICATION = 'tenant_proj.wsgi.application'
 #     }
 # }
 
+# Connection pool (psycopg 3 + psycopg_pool, Django's OPTIONS["pool"]): each
+# request checks a connection out and hands it back when it ends, so opening
+# connections drops out of request latency under WSGI and ASGI alike. Pool
+# sizes are per process. Pooling requires CONN_MAX_AGE = 0; with DB_POOL=0,
+# DB_CONN_MAX_AGE keeps connections open instead (WSGI only: under ASGI every
+# request gets a fresh thread and persistent connections would pile up).
+DB_POOL = config("DB_POOL", default=True, cast=bool)
+
 DATABASES = {
     "default": {
-        "ENGINE": "django_tenants.postgresql_backend",
+        # django_tenants backend that skips SET search_path when unchanged
+        "ENGINE": "tenant.postgresql_backend",
         "NAME": "cms",
         "USER": "cms",
         "PASSWORD": "admin123#",
         "HOST": "localhost",
         "PORT": "5432",
+        "CONN_MAX_AGE": 0 if DB_POOL else config("DB_CONN_MAX_AGE", default=0, cast=int),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "pool": {
+                "min_size": config("DB_POOL_MIN_SIZE", default=2, cast=int),
+                "max_size": config("DB_POOL_MAX_SIZE", default=10, cast=int),
+                "timeout": config("DB_POOL_TIMEOUT", default=10, cast=int),
+            },
+        } if DB_POOL else {},
     }
 }
 
+# Must be shared by every server process: tenant.cache generations,
+# users.permissions and subscription entitlement versions are invalidated
+# through it. DatabaseCache needs `manage.py createcachetable` once (it lands
+# in the public schema); point these at Redis/Memcached where available, e.g.
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# CACHE_LOCATION=redis://127.0.0.1:6379/1
+CACHE_BACKEND = config("CACHE_BACKEND", default="django.core.cache.backends.db.DatabaseCache")
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": config("CACHE_LOCATION", default="django_cache"),
+    }
+}
+if CACHE_BACKEND.endswith(".DatabaseCache"):
+    # DatabaseCache culls by key order once MAX_ENTRIES (default 300) is hit,
+    # which throws out the version keys first; size it for the response cache
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": config("CACHE_MAX_ENTRIES", default=100000, cast=int),
+    }
+
 DATABASE_ROUTERS = (
     "django_tenants.routers.TenantSyncRouter",
 )
@@ -164,6 +229,33 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# tenant.middleware.TenantMetricsMiddleware: same SQL this many times in one
+# request is logged as a possible N+1
+TENANT_METRICS_N_PLUS_ONE_THRESHOLD = 5
+
+# tenant.cache: per-schema namespace on a shared cache + local LRU tier.
+# A process-local alias (LocMemCache) disables cache_tenant_response.
+TENANT_CACHE_ALIAS = "default"
+TENANT_CACHE_LOCAL_SIZE = 1000
+TENANT_CACHE_LOCAL_TTL = 60  # seconds
+TENANT_CACHE_GENERATION_TTL = 1  # seconds other processes may serve a bumped generation
+
+# Per-tenant cache of the /api/tasks/stats/ aggregate (todo.stats)
+TASK_STATS_CACHE_TIMEOUT = 300  # seconds
+
+# tenant schemas per UNION ALL query in tenant.reporting
+TENANT_REPORT_BATCH_SIZE = 100
+
+# tenant.jobs / manage.py run_jobs
+JOB_WORKER_CONCURRENCY = 4
+JOB_RETRY_BASE_DELAY = 10  # seconds, doubled on every failed attempt
+JOB_RETRY_MAX_DELAY = 3600  # seconds
+JOB_LOCK_TIMEOUT = 600  # seconds without a heartbeat before a running job is retried
+JOB_HEARTBEAT_INTERVAL = 60  # seconds, must stay well below JOB_LOCK_TIMEOUT
+
+# Cache-Control max-age of the public home page (home.pages)
+HOME_PAGE_MAX_AGE = 300  # seconds
+
 # Static files configuration
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [
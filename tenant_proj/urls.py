@@ -11,7 +11,14 @@ urlpatterns = [
 
     # tenant-specfic urls -todo 
     path("api/tasks/", task_views.task_list, name="task-list"),
+    path("api/tasks/stats/", task_views.task_user_stats, name="task-user-stats"),
+    path("api/tasks/search/", task_views.task_search, name="task-search"),
+    path("api/tasks/bulk/", task_views.task_bulk, name="task-bulk"),
     path("api/tasks/<int:pk>/", task_views.task_detail, name="task-detail"),
+
+    # async versions for ASGI (tenant_proj.asgi)
+    path("api/async/tasks/", task_views.task_list_async, name="task-list-async"),
+    path("api/async/tasks/<int:pk>/", task_views.task_detail_async, name="task-detail-async"),
 ]
 
 if settings.DEBUG:
@@ -6,9 +6,12 @@ from django.conf import settings
 from django.conf.urls.static import static
 
 from home.api import views as home_views
+from tenant.api import views as tenant_views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("api/metrics/", tenant_views.metrics, name="tenant-metrics"),
+    path("api/reports/<str:name>/", tenant_views.report, name="tenant-report"),
 
     # public urls 
     path("", home_views.home, name="home-page"),# for home 
@@ -1,5 +1,12 @@
 from django.contrib import admin
+from tenant.admin_mixins import EstimatedCountAdminMixin
 from todo.models import Task
 # Register your models here.
 
-admin.site.register(Task)
\ No newline at end of file
+
+@admin.register(Task)
+class TaskAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    list_display = ("title", "user", "completed", "published_at", "created_at")
+    list_select_related = ("user",)
+    list_filter = ("completed",)
+    raw_id_fields = ("user",)
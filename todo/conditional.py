@@ -0,0 +1,96 @@
+# todo/conditional.py
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .models import Task
+
+
+'''
+    mentality: polling clients should get a 304 without the payload being
+    rebuilt.
+    - collection version = (count, max updated_at) of the tenant's tasks, one
+      aggregate query served by the updated_at index. ETag only: a delete
+      changes the count but not max(updated_at), so a Last-Modified would
+      give If-Modified-Since clients a false 304.
+    - row version = that task's updated_at, read by primary key; ETag and
+      Last-Modified.
+    - like django.views.decorators.http.condition, but the version is
+      computed once per request and async views get it off the event loop.
+'''
+def task_collection_version(request, *args, **kwargs):
+    version = Task.objects.order_by().aggregate(count=Count("id"), last=Max("updated_at"))
+    if version["last"] is None:
+        return '"empty"', None
+    return f'"{version["count"]}-{version["last"].timestamp():.6f}"', None
+
+
+def task_row_version(request, pk, *args, **kwargs):
+    updated_at = (
+        Task.objects.filter(pk=pk).order_by()
+        .values_list("updated_at", flat=True).first()
+    )
+    if updated_at is None:
+        # let the view answer 404
+        return None, None
+    return f'"{pk}-{updated_at.timestamp():.6f}"', updated_at
+
+
+def conditional(version_func):
+    """
+    Answer 304 / 412 from ``version_func(request, *args, **kwargs)``, which
+    returns (etag, last_modified), and add ETag / Last-Modified headers.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def inner(request, *args, **kwargs):
+                def compute():
+                    tenant = getattr(request, "tenant", None)
+                    if tenant is not None:
+                        connection.set_tenant(tenant)
+                    return version_func(request, *args, **kwargs)
+
+                etag, last_modified = await sync_to_async(compute)()
+                response = _precondition(request, etag, last_modified)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _add_headers(request, response, etag, last_modified)
+
+        else:
+
+            @wraps(view)
+            def inner(request, *args, **kwargs):
+                etag, last_modified = version_func(request, *args, **kwargs)
+                response = _precondition(request, etag, last_modified)
+                if response is None:
+                    response = view(request, *args, **kwargs)
+                return _add_headers(request, response, etag, last_modified)
+
+        return inner
+
+    return decorator
+
+
+def _precondition(request, etag, last_modified):
+    if etag is None:
+        return None
+    return get_conditional_response(
+        request,
+        etag=quote_etag(etag),
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+
+
+def _add_headers(request, response, etag, last_modified):
+    if request.method in ("GET", "HEAD") and etag is not None and response.status_code in (200, 304):
+        response.headers.setdefault("ETag", quote_etag(etag))
+        if last_modified:
+            response.headers.setdefault("Last-Modified", http_date(last_modified.timestamp()))
+    return response
@@ -0,0 +1,81 @@
+# todo/factories.py
+import random
+import uuid
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Task
+
+
+'''
+    mentality: realistic task volumes for load testing.
+    - tasks are generated lazily and inserted with bulk_create in batches, so
+      memory stays flat even for millions of rows.
+    - each batch goes through Task.objects.bulk_create_validated(): Task.clean
+      rules per row (no DB), and a single uniqueness query.
+'''
+WORDS = (
+    "setup deploy review design write test fix update migrate refactor "
+    "document plan release monitor audit backup configure invite call "
+    "report invoice schedule onboard archive sync export import verify"
+).split()
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def generate_tasks(users, count, start=0, seed=None, days=365):
+    """
+    Yield ``count`` unsaved Task instances spread round-robin over ``users``.
+
+    Descriptions carry a run token plus a sequence number starting at
+    ``start``, so they are unique within the run; a seeded run reuses its
+    token, pass the number of tasks already generated as ``start`` to top up.
+    """
+    rng = random.Random(seed)
+    run = uuid.uuid4().hex[:8] if seed is None else f"{seed:08x}"[-8:]
+    now = timezone.now()
+    span = days * 24 * 3600
+
+    for i in range(start, start + count):
+        created_at = now - timedelta(seconds=rng.randint(0, span))
+        completed = rng.random() < 0.4
+        published_at = None
+        if rng.random() < 0.5:
+            published_at = created_at + timedelta(seconds=rng.randint(0, int((now - created_at).total_seconds())))
+        words = " ".join(rng.choices(WORDS, k=rng.randint(3, 60)))
+        yield Task(
+            user=users[i % len(users)],
+            title=" ".join(rng.choices(WORDS, k=rng.randint(2, 6))).capitalize(),
+            description=f"[{run}-{i}] {words}"[:500],
+            completed=completed,
+            published_at=published_at,
+            created_at=created_at,
+        )
+
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bulk_insert(tasks, batch_size=DEFAULT_BATCH_SIZE, on_batch=None):
+    """
+    Validate and bulk_create ``tasks`` (any iterable) ``batch_size`` at a time.
+    ``on_batch(inserted_so_far)`` is called after each committed batch.
+    """
+    inserted = 0
+    for batch in batched(tasks, batch_size):
+        with transaction.atomic():
+            Task.objects.bulk_create_validated(batch, batch_size=batch_size)
+        inserted += len(batch)
+        if on_batch:
+            on_batch(inserted)
+    return inserted
@@ -0,0 +1,73 @@
+import time
+
+from django.core.management import BaseCommand, CommandError
+from django_tenants.utils import schema_context, schema_exists
+
+from todo.models import Task
+from todo.serializers import serialize_row, task_rows
+
+
+class Command(BaseCommand):
+    help = "Compare rows/sec of model-instance vs column-projected Task serialization"
+
+    def add_arguments(self, parser):
+        parser.add_argument("schema_name", help="Tenant schema to read tasks from")
+        parser.add_argument("--rows", type=int, default=None, help="Limit rows per run (default: all)")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per serializer, best run is reported")
+
+    def handle(self, *args, **options):
+        schema_name = options["schema_name"]
+        if not schema_exists(schema_name):
+            raise CommandError(f'Schema "{schema_name}" does not exist')
+
+        serializers = {
+            "instances": self.serialize_instances,
+            "projected": self.serialize_projected,
+        }
+
+        with schema_context(schema_name):
+            results = {}
+            for name, serialize in serializers.items():
+                results[name] = self.best_of(serialize, options["rows"], options["repeat"])
+
+        for name, (rows, seconds) in results.items():
+            rate = rows / seconds if seconds else 0
+            self.stdout.write(f"{name:<10} {rows} rows  {seconds * 1000:.1f} ms  {rate:,.0f} rows/s")
+
+        _, baseline = results["instances"]
+        _, projected = results["projected"]
+        if projected:
+            self.stdout.write(self.style.SUCCESS(f"speedup: {baseline / projected:.2f}x"))
+
+    def best_of(self, serialize, limit, repeat):
+        best = None
+        rows = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = len(serialize(limit))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return rows, best
+
+    # the pre-projection views: full Task instances + Python properties
+    def serialize_instances(self, limit):
+        tasks = Task.objects.all()
+        if limit:
+            tasks = tasks[:limit]
+        return [
+            {
+                "id": t.id,
+                "title": t.title,
+                "description": t.description,
+                "completed": t.completed,
+                "published_at": t.published_at,
+                "summary": t.summary,
+                "is_overdue": t.is_overdue,
+            } for t in tasks
+        ]
+
+    def serialize_projected(self, limit):
+        rows = task_rows()
+        if limit:
+            rows = rows[:limit]
+        return [serialize_row(row) for row in rows]
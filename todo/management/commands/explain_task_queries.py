@@ -0,0 +1,124 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.db.models import Count
+from django_tenants.utils import schema_context, schema_exists
+
+from todo.factories import DEFAULT_BATCH_SIZE, bulk_insert, generate_tasks
+from todo.models import Task
+from users.models import CustomUser
+
+
+# the only index Task had before the access-pattern indexes
+LEGACY_INDEXES = [
+    models.Index(fields=['completed'], name='todo_task_complet_91253e_idx'),
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN ANALYZE the standard Task queries in a tenant schema, with the "
+        "current indexes and with the legacy single-column index (rolled back). "
+        "Dropping indexes locks todo_task while it runs: use a benchmark database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("schema_name", help="Tenant schema to benchmark")
+        parser.add_argument(
+            "--generate",
+            type=int,
+            default=0,
+            help="Top the tenant up to this many synthetic tasks first",
+        )
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument(
+            "--current-only",
+            action="store_true",
+            help="Skip the legacy-index comparison",
+        )
+
+    def handle(self, *args, **options):
+        schema_name = options["schema_name"]
+        if not schema_exists(schema_name):
+            raise CommandError(f'Schema "{schema_name}" does not exist')
+
+        with schema_context(schema_name):
+            if options["generate"]:
+                self.generate(schema_name, options["generate"], options["seed"])
+
+            user_id = (
+                Task.objects.values("user_id").annotate(n=Count("id"))
+                .order_by("-n").values_list("user_id", flat=True).first()
+            )
+            if user_id is None:
+                raise CommandError("No tasks to benchmark, use --generate")
+
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Task._meta.db_table}")
+
+            self.stdout.write(self.style.MIGRATE_HEADING("== current indexes"))
+            self.explain_all(user_id)
+
+            if not options["current_only"]:
+                self.stdout.write(self.style.MIGRATE_HEADING("== legacy indexes"))
+                self.with_legacy_indexes(lambda: self.explain_all(user_id))
+
+    def generate(self, schema_name, total, seed):
+        users = list(CustomUser.objects.filter(tenants__schema_name=schema_name)[:20])
+        if not users:
+            raise CommandError(f"{schema_name} has no users to own generated tasks")
+        existing = Task.objects.count()
+        if total > existing:
+            bulk_insert(
+                generate_tasks(users, total - existing, start=existing, seed=seed),
+                batch_size=DEFAULT_BATCH_SIZE,
+            )
+        self.stdout.write(f"{max(total, existing)} tasks in {schema_name}")
+
+    def queries(self, user_id):
+        tasks = Task.objects.order_by("-created_at", "-id")
+        last = tasks.values("created_at", "id")[1000:1001].first()
+        return {
+            "task list, first page": tasks[:50],
+            "task list, keyset page": tasks.filter(
+                models.Q(created_at__lt=last["created_at"])
+                | models.Q(created_at=last["created_at"], id__lt=last["id"])
+            )[:50] if last else tasks[:50],
+            "user open tasks": tasks.filter(user_id=user_id, completed=False)[:50],
+            "user completed tasks": tasks.filter(user_id=user_id, completed=True)[:50],
+            "overdue tasks": tasks.filter(published_at__isnull=False, completed=False)[:50],
+            "overdue count": Task.objects.filter(published_at__isnull=False, completed=False),
+        }
+
+    def explain_all(self, user_id):
+        for name, queryset in self.queries(user_id).items():
+            if name.endswith("count"):
+                plan = self.explain_count(queryset)
+            else:
+                plan = queryset.explain(analyze=True)
+            self.stdout.write(self.style.SUCCESS(name))
+            self.stdout.write(plan)
+            self.stdout.write("")
+
+    def explain_count(self, queryset):
+        # QuerySet.explain() can't wrap count(), build the same SQL by hand
+        sql, params = queryset.order_by().values("id").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN ANALYZE SELECT COUNT(*) FROM ({sql}) AS q", params)
+            return "\n".join(row[0] for row in cursor.fetchall())
+
+    def with_legacy_indexes(self, run):
+        try:
+            with transaction.atomic():
+                with connection.schema_editor() as editor:
+                    for index in Task._meta.indexes:
+                        editor.remove_index(Task, index)
+                    for index in LEGACY_INDEXES:
+                        editor.add_index(Task, index)
+                run()
+                raise _Rollback
+        except _Rollback:
+            pass
@@ -0,0 +1,78 @@
+import hashlib
+
+from django.db import migrations, models, transaction
+
+
+BATCH_SIZE = 2000
+
+
+def backfill_description_hash(apps, schema_editor):
+    # runs once per tenant schema under migrate_schemas; commits per batch so
+    # large tables don't hold one long transaction
+    Task = apps.get_model("todo", "Task")
+    while True:
+        with transaction.atomic():
+            batch = list(
+                Task.objects.filter(description_hash__isnull=True)
+                .only("id", "description")
+                .order_by("id")[:BATCH_SIZE]
+            )
+            if not batch:
+                return
+            for task in batch:
+                task.description_hash = hashlib.sha256(task.description.encode("utf-8")).hexdigest()
+            Task.objects.bulk_update(batch, ["description_hash"])
+
+
+def finish_backfill(apps, schema_editor):
+    # rows inserted by the old code while the batches ran have no hash yet:
+    # hash them and add NOT NULL in one transaction, under a lock that keeps
+    # writers out until the column is enforced (readers are not blocked)
+    Task = apps.get_model("todo", "Task")
+    table = schema_editor.quote_name(Task._meta.db_table)
+    with transaction.atomic(using=schema_editor.connection.alias):
+        schema_editor.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+        schema_editor.execute(
+            f"UPDATE {table} SET description_hash = "
+            f"ENCODE(SHA256(CONVERT_TO(description, 'UTF8')), 'hex') "
+            f"WHERE description_hash IS NULL"
+        )
+        schema_editor.execute(f"ALTER TABLE {table} ALTER COLUMN description_hash SET NOT NULL")
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('todo', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='description_hash',
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_description_hash, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(finish_backfill, migrations.RunPython.noop),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='task',
+                    name='description_hash',
+                    field=models.CharField(editable=False, max_length=64),
+                ),
+            ],
+        ),
+        migrations.RemoveConstraint(
+            model_name='task',
+            name='unique_task_description',
+        ),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(fields=('description_hash',), name='unique_task_description', violation_error_message='Task with this description already exists.'),
+        ),
+    ]
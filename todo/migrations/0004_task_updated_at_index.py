@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-17 17:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo', '0003_task_access_pattern_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-updated_at'], name='task_updated_idx'),
+        ),
+    ]
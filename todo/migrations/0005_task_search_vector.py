@@ -0,0 +1,34 @@
+# Generated by Django 5.1.15 on 2026-10-17 17:33
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Adding the stored GeneratedField rewrites todo_task under an ACCESS
+    # EXCLUSIVE lock: reads and writes of the tenant's tasks block until the
+    # whole table has been rewritten, so run it in a maintenance window on
+    # large tenants. Only the GIN index that follows is built CONCURRENTLY
+    # (hence atomic = False) and doesn't block writes.
+    atomic = False
+
+    dependencies = [
+        ('todo', '0004_task_updated_at_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('description', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='task_search_idx'),
+        ),
+    ]
@@ -1,7 +1,17 @@
+import hashlib
+from collections import Counter
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from users.models import CustomUser
+from tenant.cache import tenant_cache
+from tenant.usage import add_task_usage, check_storage, task_size
+
+# text search configuration of Task.search_vector and todo.search queries
+SEARCH_CONFIG = "english"
 
 class BaseModel(models.Model):
     created_at = models.DateTimeField(db_index=True, default=timezone.now)
@@ -11,12 +21,178 @@ class BaseModel(models.Model):
         abstract = True
 
  
+DUPLICATE_DESCRIPTION = "Task with this description already exists."
+
+
+def hash_description(description):
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+
+class AnyLookup(models.Lookup):
+    """``field = ANY(%s)`` with the values sent as a single array parameter."""
+    lookup_name = "any"
+
+    def get_prep_lookup(self):
+        # lhs may still be an unresolved F() here, values are prepped in as_sql
+        return list(self.rhs)
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        values = [self.lhs.output_field.get_prep_value(v) for v in self.rhs]
+        return f"{lhs} = ANY(%s)", [*lhs_params, values]
+
+
+class DescriptionHash(models.Func):
+    """
+    hash_description() in SQL: hex SHA-256 of the UTF-8 text. Django's
+    SHA256() needs pgcrypto on PostgreSQL, sha256(bytea) is built in.
+    """
+    template = "ENCODE(SHA256(CONVERT_TO(%(expressions)s, 'UTF8')), 'hex')"
+    output_field = models.CharField()
+
+
+class TaskQuerySet(models.QuerySet):
+    '''
+        bulk versions of the Task state changes:
+        - mark_complete / mark_incomplete: one UPDATE ... WHERE id = ANY(...),
+          updated_at is set explicitly since update() skips auto_now.
+        - bulk_create_validated: Task.clean rules + one uniqueness query per
+          batch, then bulk_create.
+
+        bulk_create / bulk_update / update skip save() and its signals, so:
+        - bulk_create / bulk_update fill description_hash themselves,
+          update(description=...) sets it alongside, in SQL when the new
+          description is an expression.
+        - all three bump the tenant cache generation (tenant.cache) once the
+          transaction commits, which drops the cached per-user stats and task
+          responses.
+        - bulk_create / bulk_update move the tenant usage counters
+          (tenant.usage); bulk_create_validated checks the storage quota.
+    '''
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.set_description_hash()
+        created = super().bulk_create(objs, *args, **kwargs)
+        if not (kwargs.get("ignore_conflicts") or kwargs.get("update_conflicts")):
+            # with conflicts skipped we can't tell what was inserted: reconcile_usage
+            for obj in created:
+                obj.stored_size = obj.text_size()
+            add_task_usage(tasks=len(created), storage_bytes=sum(obj.stored_size or 0 for obj in created))
+        tenant_cache.bump_on_commit(using=self.db)
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if "description" in fields:
+            for obj in objs:
+                obj.set_description_hash()
+            fields = [*fields, "description_hash"]
+        updated = super().bulk_update(objs, fields, *args, **kwargs)
+        if {"title", "description"} & set(fields):
+            delta = 0
+            for obj in objs:
+                previous, obj.stored_size = obj.stored_size, obj.text_size()
+                if previous is not None and obj.stored_size is not None:
+                    delta += obj.stored_size - previous
+            add_task_usage(storage_bytes=delta)
+        tenant_cache.bump_on_commit(using=self.db)
+        return updated
+
+    def update(self, **kwargs):
+        if "description" in kwargs:
+            description = kwargs["description"]
+            if hasattr(description, "resolve_expression"):
+                kwargs["description_hash"] = DescriptionHash(description)
+            else:
+                kwargs["description_hash"] = hash_description(description)
+        updated = super().update(**kwargs)
+        tenant_cache.bump_on_commit(using=self.db)
+        return updated
+
+    #----------bulk state changes------------
+    def _with_ids(self, ids):
+        return self.filter(AnyLookup(models.F("id"), list(ids)))
+
+    def mark_complete(self, ids):
+        ids = list(ids)
+        if not ids:
+            return 0
+        return self._with_ids(ids).update(completed=True, updated_at=timezone.now())
+
+    def mark_incomplete(self, ids):
+        ids = list(ids)
+        if not ids:
+            return 0
+        return self._with_ids(ids).update(completed=False, updated_at=timezone.now())
+
+    #----------batched create------------
+    def validate_batch(self, tasks):
+        """
+        Validate unsaved tasks the way full_clean() would, without one
+        uniqueness query per row. Raises ValidationError listing bad rows.
+        """
+        errors = {}
+        for index, task in enumerate(tasks):
+            try:
+                # the FK check would cost a query per row; callers pass real users
+                task.clean_fields(exclude=["user"])
+                task.clean()
+            except ValidationError as exc:
+                errors[index] = exc.messages
+
+        # clean() has set description_hash, which carries unique_task_description
+        counts = Counter(task.description_hash for task in tasks)
+        taken = set(
+            self.model.objects.filter(description_hash__in=list(counts))
+            .values_list("description_hash", flat=True)
+        )
+        for index, task in enumerate(tasks):
+            if counts[task.description_hash] > 1 or task.description_hash in taken:
+                errors.setdefault(index, []).append("Task with this description already exists")
+
+        if errors:
+            raise ValidationError(
+                [f"task #{index}: {'; '.join(messages)}" for index, messages in sorted(errors.items())]
+            )
+
+    def bulk_create_validated(self, tasks, batch_size=None):
+        tasks = list(tasks)
+        self.validate_batch(tasks)
+        check_storage(sum(task.text_size() or 0 for task in tasks))
+        return self.bulk_create(tasks, batch_size=batch_size)
+
+
+class TaskManager(models.Manager.from_queryset(TaskQuerySet)):
+    def get_queryset(self):
+        # the tsvector is only read by SQL in todo.search, never by Python:
+        # don't ship it with every row the admin, views and collectors load
+        return super().get_queryset().defer("search_vector")
+
+
 class Task(BaseModel):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='tasks')
     title = models.CharField(max_length=200)
     description = models.TextField(max_length=500)  
+    # sha256 of description, carries the uniqueness constraint (see Meta)
+    description_hash = models.CharField(max_length=64, editable=False)
     completed = models.BooleanField(default=False)
     published_at = models.DateTimeField(null=True, blank=True)
+    # title (weight A) + description (weight B), kept by Postgres, see todo.search;
+    # deferred by TaskManager
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = TaskManager()
+
+    # bytes of title + description as last saved/loaded, for tenant.usage
+    stored_size = None
 
      
     #------validation------------
@@ -31,6 +207,27 @@ class Task(BaseModel):
             raise ValidationError({'published_at':'published_at cannot be in the future'})
         if len(self.description) < 5:
             raise ValidationError({'description':'description should be at least 5 characters long'})        
+        # full_clean() validates constraints after clean(), keep the hash current for it
+        self.set_description_hash()
+
+    def validate_constraints(self, exclude=None):
+        """
+        unique_task_description is on description_hash, which forms always
+        exclude (editable=False): check it whenever description is checked,
+        and report it on description.
+        """
+        if exclude is not None and "description" not in exclude:
+            exclude = set(exclude) - {"description_hash"}
+        self.set_description_hash()
+        try:
+            super().validate_constraints(exclude=exclude)
+        except ValidationError as exc:
+            errors = exc.update_error_dict({})
+            if errors.pop("description_hash", None) is not None:
+                errors.setdefault("description", []).append(
+                    ValidationError(DUPLICATE_DESCRIPTION, code="unique")
+                )
+            raise ValidationError(errors)
     
     
     #--------properties------------
@@ -70,6 +267,29 @@ class Task(BaseModel):
         self.completed = False
         self.updated_at = timezone.now()
         return self
+
+    def text_size(self):
+        """Bytes counted against storage, None when title/description are deferred."""
+        if "title" not in self.__dict__ or "description" not in self.__dict__:
+            return None
+        return task_size(self.title, self.description)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.stored_size = instance.text_size()
+        return instance
+
+    def set_description_hash(self):
+        self.description_hash = hash_description(self.description or "")
+        return self
+
+    def save(self, *args, **kwargs):
+        self.set_description_hash()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "description" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "description_hash"}
+        super().save(*args, **kwargs)
     
 
     #-----------Meta---------------
@@ -77,17 +297,41 @@ class Task(BaseModel):
         mentality : how should this model behave in the DB ?
         - ordering: default ordering by created_at descending.
         - verbose_name: human readable name for admin.
-        - unique constraint: description must be unique.
-        - index: index on completed for faster queries.
+        - unique constraint: description must be unique, enforced on its
+          fixed-size sha256 so the index doesn't grow with description length.
+        - indexes follow how tasks are actually read:
+            * (user, completed, -created_at): a user's open/done tasks, newest first
+            * (-created_at, -id): the task list and its keyset pagination
+            * (-updated_at): max(updated_at) for the collection ETag
+            * partial on open tasks and on overdue tasks
+              (published_at IS NOT NULL AND completed = false)
+            * GIN on search_vector for full-text search
     '''
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Task'
         constraints = [
-            models.UniqueConstraint(fields=['description'], name='unique_task_description')
+            models.UniqueConstraint(
+                fields=['description_hash'],
+                name='unique_task_description',
+                violation_error_message=DUPLICATE_DESCRIPTION,
+            )
         ]
         indexes = [
-            models.Index(fields=['completed']),
+            models.Index(fields=['user', 'completed', '-created_at'], name='task_user_completed_idx'),
+            models.Index(fields=['-created_at', '-id'], name='task_created_id_idx'),
+            models.Index(fields=['-updated_at'], name='task_updated_idx'),
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(completed=False),
+                name='task_open_idx',
+            ),
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(published_at__isnull=False, completed=False),
+                name='task_overdue_idx',
+            ),
+            GinIndex(fields=['search_vector'], name='task_search_idx'),
         ]
     
     def __str__(self):
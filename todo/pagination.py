@@ -0,0 +1,139 @@
+# todo/pagination.py
+import base64
+import binascii
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+STREAM_CHUNK_SIZE = 2000
+STREAM_FLUSH_SIZE = 200
+
+
+'''
+    mentality: keyset (cursor) pagination over the default Task ordering.
+    - Task.Meta.ordering is -created_at, ties are broken by -id.
+    - the cursor is the (created_at, id) of the last row on the previous page,
+      so the next page is a single indexed range scan instead of an OFFSET.
+'''
+def encode_cursor(created_at, pk):
+    raw = f"{created_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return (created_at, id) for a cursor, or raise ValueError."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded).decode().split("|")
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if created_at is None:
+        raise ValueError("Invalid cursor")
+    return created_at, pk
+
+
+def parse_page_size(value, default=DEFAULT_PAGE_SIZE):
+    if value in (None, ""):
+        return default
+    size = int(value)
+    if size <= 0:
+        raise ValueError("limit must be greater than 0")
+    return min(size, MAX_PAGE_SIZE)
+
+
+def keyset_page(queryset, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return (rows, next_cursor) for one page of ``queryset``.
+
+    ``queryset`` may yield model instances or ``.values()`` dicts; either way
+    it must expose ``created_at`` and ``id``. ``next_cursor`` is None on the
+    last page.
+    """
+    # fetch one extra row to know whether another page exists
+    rows = list(_after_cursor(queryset, cursor)[: limit + 1])
+    return _split_page(rows, limit)
+
+
+async def akeyset_page(queryset, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """Async keyset_page() for the async views."""
+    rows = [row async for row in _after_cursor(queryset, cursor)[: limit + 1]]
+    return _split_page(rows, limit)
+
+
+def _after_cursor(queryset, cursor):
+    queryset = queryset.order_by("-created_at", "-id")
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+    return queryset
+
+
+def _split_page(rows, limit):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if isinstance(last, dict):
+            next_cursor = encode_cursor(last["created_at"], last["id"])
+        else:
+            next_cursor = encode_cursor(last.created_at, last.id)
+    return rows, next_cursor
+
+
+def stream_json_array(rows, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yield a JSON array one element at a time.
+
+    ``rows`` is consumed with ``.iterator(chunk_size=...)`` when it is a
+    queryset, so only ``chunk_size`` rows are held in memory at once.
+    """
+    if hasattr(rows, "iterator"):
+        rows = rows.iterator(chunk_size=chunk_size)
+
+    writer = _JSONArrayWriter(serialize)
+    for row in rows:
+        chunk = writer.add(row)
+        if chunk:
+            yield chunk
+    yield writer.close()
+
+
+async def astream_json_array(queryset, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    """Async stream_json_array(), reads ``queryset`` with ``.aiterator()``."""
+    writer = _JSONArrayWriter(serialize)
+    async for row in queryset.aiterator(chunk_size=chunk_size):
+        chunk = writer.add(row)
+        if chunk:
+            yield chunk
+    yield writer.close()
+
+
+class _JSONArrayWriter:
+    def __init__(self, serialize):
+        self.serialize = serialize
+        self.encoder = DjangoJSONEncoder()
+        self.buffer = ["["]
+        self.first = True
+
+    def add(self, row):
+        if not self.first:
+            self.buffer.append(",")
+        self.buffer.append(self.encoder.encode(self.serialize(row)))
+        self.first = False
+        # flush in blocks so the response isn't written one row at a time
+        if len(self.buffer) >= STREAM_FLUSH_SIZE:
+            chunk, self.buffer = "".join(self.buffer), []
+            return chunk
+        return None
+
+    def close(self):
+        self.buffer.append("]")
+        return "".join(self.buffer)
@@ -0,0 +1,74 @@
+# todo/search.py
+import base64
+import binascii
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast
+
+from .models import SEARCH_CONFIG
+from .pagination import DEFAULT_PAGE_SIZE
+
+
+MAX_QUERY_LENGTH = 200
+
+
+'''
+    mentality: full-text search on the stored Task.search_vector.
+    - matching is a GIN index lookup (task_search_idx), the query text is
+      parsed with websearch_to_tsquery: words, "phrases", or, -exclude.
+    - results are ordered by ts_rank (title hits outrank description hits,
+      see the A/B weights), ties by -id.
+    - keyset pagination on (rank, id): the cursor is the rank and id of the
+      last row, so later pages never OFFSET through earlier matches.
+'''
+def search_tasks(queryset, text):
+    """Tasks of ``queryset`` matching ``text``, annotated with ``rank``."""
+    text = (text or "").strip()
+    if not text:
+        raise ValueError("q is required")
+    if len(text) > MAX_QUERY_LENGTH:
+        raise ValueError(f"q must be at most {MAX_QUERY_LENGTH} characters")
+    query = SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+    return (
+        queryset
+        .filter(search_vector=query)
+        # ts_rank() is a float4: as float8 it reaches Python, and comes back in
+        # the cursor, without rounding, so keyset comparisons stay exact
+        .annotate(rank=Cast(SearchRank(F("search_vector"), query), FloatField()))
+    )
+
+
+def encode_rank_cursor(rank, pk):
+    raw = f"{rank!r}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_rank_cursor(cursor):
+    """Return (rank, id) for a search cursor, or raise ValueError."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, pk = base64.urlsafe_b64decode(padded).decode().split("|")
+        return float(rank), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def rank_page(rows, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return (rows, next_cursor) for one page of ranked search ``rows``.
+
+    ``rows`` is a search_tasks() queryset, optionally projected with
+    task_rows(..., extra=("rank",)).
+    """
+    rows = rows.order_by("-rank", "-id")
+    if cursor:
+        rank, pk = decode_rank_cursor(cursor)
+        rows = rows.filter(Q(rank__lt=rank) | Q(rank=rank, id__lt=pk))
+    rows = list(rows[: limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_rank_cursor(last["rank"], last["id"])
+    return rows, next_cursor
@@ -0,0 +1,63 @@
+# todo/serializers.py
+from django.db.models import BooleanField, Case, F, TextField, Value, When
+from django.db.models.functions import Concat, Length, Substr
+
+from .models import Task
+
+
+'''
+    mentality: serialize tasks straight from the columns we need.
+    - .values() means no Task instances are built per row.
+    - summary / is_overdue mirror the Task properties but are computed in SQL,
+      keep them in sync with todo.models.Task if the rules change.
+'''
+TASK_FIELDS = ("id", "title", "description", "completed", "published_at")
+TASK_OUTPUT_FIELDS = TASK_FIELDS + ("summary", "is_overdue")
+
+# Task.summary: description truncated to 47 chars + '...' when longer than 50
+SUMMARY_SQL = Concat(
+    F("title"),
+    Value(" : "),
+    Case(
+        When(
+            description_length__gt=50,
+            then=Concat(Substr("description", 1, 47), Value("...")),
+        ),
+        default=F("description"),
+        output_field=TextField(),
+    ),
+    output_field=TextField(),
+)
+
+# Task.is_overdue: published but not completed
+IS_OVERDUE_SQL = Case(
+    When(published_at__isnull=False, completed=False, then=Value(True)),
+    default=Value(False),
+    output_field=BooleanField(),
+)
+
+
+def task_rows(queryset=None, extra=()):
+    """
+    Project ``queryset`` (default: all tasks) to plain dicts.
+
+    ``created_at`` and the ``extra`` fields / annotations are kept in each row
+    because keyset pagination needs them, ``serialize_row`` drops them.
+    """
+    if queryset is None:
+        queryset = Task.objects.all()
+    return (
+        queryset
+        .annotate(description_length=Length("description"))
+        .values(
+            *TASK_FIELDS,
+            "created_at",
+            *extra,
+            summary=SUMMARY_SQL,
+            is_overdue=IS_OVERDUE_SQL,
+        )
+    )
+
+
+def serialize_row(row):
+    return {field: row[field] for field in TASK_OUTPUT_FIELDS}
@@ -0,0 +1,30 @@
+# todo/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from todo.models import Task
+from tenant.cache import tenant_cache
+from tenant.usage import add_task_usage
+
+
+@receiver([post_save, post_delete], sender=Task)
+def task_changed(sender, instance, **kwargs):
+    # drops cached stats and task responses of this tenant, after the commit
+    tenant_cache.bump_on_commit()
+
+
+# per-tenant task / storage counters (tenant.usage)
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not {"title", "description"} & set(update_fields):
+        return
+    previous, instance.stored_size = instance.stored_size, instance.text_size()
+    if created:
+        add_task_usage(tasks=1, storage_bytes=instance.stored_size or 0)
+    elif previous is not None and instance.stored_size is not None:
+        add_task_usage(storage_bytes=instance.stored_size - previous)
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, **kwargs):
+    add_task_usage(tasks=-1, storage_bytes=-(instance.stored_size or 0))
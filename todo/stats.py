@@ -0,0 +1,51 @@
+# todo/stats.py
+from django.conf import settings
+from django.db.models import Count, Q
+
+from tenant.cache import tenant_cache
+
+
+'''
+    mentality: dashboards poll per-user task counts, so compute them for the
+    whole tenant in one GROUP BY and keep the result in the tenant cache.
+    - Task save/delete signals and the TaskQuerySet bulk paths bump the
+      tenant cache generation, which drops it.
+'''
+STATS_CACHE_KEY = "todo:user-task-stats"
+
+
+def user_task_stats():
+    """Per-user completed / open / overdue / total counts for the current tenant."""
+    return tenant_cache.get_or_set(
+        STATS_CACHE_KEY,
+        compute_user_task_stats,
+        getattr(settings, "TASK_STATS_CACHE_TIMEOUT", 300),
+    )
+
+
+def compute_user_task_stats():
+    from todo.models import Task
+
+    rows = (
+        Task.objects.order_by()
+        .values("user_id", "user__email")
+        .annotate(
+            total=Count("id"),
+            completed=Count("id", filter=Q(completed=True)),
+            open=Count("id", filter=Q(completed=False)),
+            overdue=Count("id", filter=Q(completed=False, published_at__isnull=False)),
+        )
+        .order_by("user_id")
+    )
+    return [
+        {
+            "user_id": row["user_id"],
+            "email": row["user__email"],
+            "total": row["total"],
+            "completed": row["completed"],
+            "open": row["open"],
+            "overdue": row["overdue"],
+        }
+        for row in rows
+    ]
+
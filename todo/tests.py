@@ -1,3 +1,223 @@
-from django.test import TestCase
+import json
+from datetime import datetime, timezone as dt_timezone
 
-# Create your tests here.
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.forms import modelform_factory
+from django.test import SimpleTestCase
+from django_tenants.test.cases import TenantTestCase
+
+from tenant.cache import tenant_cache
+from users.models import CustomUser
+
+from .pagination import (
+    STREAM_FLUSH_SIZE,
+    _split_page,
+    decode_cursor,
+    encode_cursor,
+    parse_page_size,
+    stream_json_array,
+)
+from .models import DUPLICATE_DESCRIPTION, Task
+from .search import decode_rank_cursor, encode_rank_cursor
+from .views import parse_completed, task_from_payload
+
+
+class CursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        created_at = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc)
+        self.assertEqual(decode_cursor(encode_cursor(created_at, 42)), (created_at, 42))
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor(datetime(2026, 3, 1, tzinfo=dt_timezone.utc), 7)
+        self.assertNotIn("=", cursor)
+        self.assertRegex(cursor, r"^[A-Za-z0-9_-]+$")
+
+    def test_invalid_cursor(self):
+        # garbage, empty, "foo|bar", "2026-01-01" (no id)
+        for cursor in ("not-a-cursor", "", "Zm9vfGJhcg", "MjAyNi0wMS0wMQ"):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(ValueError):
+                    decode_cursor(cursor)
+
+    def test_rank_round_trip(self):
+        rank = 0.0607927106320858
+        self.assertEqual(decode_rank_cursor(encode_rank_cursor(rank, 9)), (rank, 9))
+
+    def test_invalid_rank_cursor(self):
+        with self.assertRaises(ValueError):
+            decode_rank_cursor("bm9wZQ")
+
+
+class PageTests(SimpleTestCase):
+    def rows(self, n):
+        start = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+        return [{"id": n - i, "created_at": start.replace(day=n - i)} for i in range(n)]
+
+    def test_last_page_has_no_cursor(self):
+        rows = self.rows(3)
+        self.assertEqual(_split_page(rows, 3), (rows, None))
+
+    def test_extra_row_becomes_the_cursor(self):
+        rows = self.rows(4)
+        page, cursor = _split_page(rows, 3)
+        self.assertEqual(page, rows[:3])
+        self.assertEqual(decode_cursor(cursor), (rows[2]["created_at"], rows[2]["id"]))
+
+    def test_page_size(self):
+        self.assertEqual(parse_page_size(None), 50)
+        self.assertEqual(parse_page_size("10"), 10)
+        self.assertEqual(parse_page_size("100000"), 500)
+        for value in ("0", "-1", "ten"):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    parse_page_size(value)
+
+
+class StreamTests(SimpleTestCase):
+    def test_empty(self):
+        self.assertEqual("".join(stream_json_array([], str)), "[]")
+
+    def test_chunks_form_one_array(self):
+        rows = list(range(STREAM_FLUSH_SIZE * 2 + 3))
+        chunks = list(stream_json_array(rows, lambda n: {"n": n}))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(json.loads("".join(chunks)), [{"n": n} for n in rows])
+
+
+class PayloadTests(SimpleTestCase):
+    def test_completed(self):
+        self.assertIs(parse_completed(False), False)
+        self.assertIs(parse_completed("false"), False)
+        self.assertIs(parse_completed("TRUE"), True)
+        for value in ("no", 1, None, []):
+            with self.subTest(value=value):
+                with self.assertRaises(ValidationError):
+                    parse_completed(value)
+
+    def test_naive_published_at_is_made_aware(self):
+        task = task_from_payload({"published_at": "2026-01-01T10:00:00", "user": 1}, None)
+        self.assertIsNotNone(task.published_at.tzinfo)
+
+    def test_invalid_published_at(self):
+        with self.assertRaises(ValidationError):
+            task_from_payload({"published_at": "yesterday", "user": 1}, None)
+
+
+#----------database tests (tenant schema)------------
+class TaskTestCase(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = "Test tenant"
+        tenant.slug = "test"
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(email="owner@example.com")
+
+    def make_task(self, description, **kwargs):
+        return Task.objects.create(user=self.user, title=description[:20], description=description, **kwargs)
+
+
+class DescriptionUniquenessTests(TaskTestCase):
+    form_class = modelform_factory(Task, fields=["user", "title", "description", "completed"])
+
+    def data(self, description):
+        return {"user": self.user.pk, "title": "title", "description": description}
+
+    def test_form_reports_duplicate_description(self):
+        self.make_task("the same description")
+        form = self.form_class(data=self.data("the same description"))
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors["description"], [DUPLICATE_DESCRIPTION])
+
+    def test_form_accepts_new_description(self):
+        self.make_task("the same description")
+        self.assertTrue(self.form_class(data=self.data("another description")).is_valid())
+
+    def test_editing_keeps_own_description(self):
+        task = self.make_task("the same description")
+        form = self.form_class(data=self.data("the same description"), instance=task)
+        self.assertTrue(form.is_valid())
+
+
+class BulkStateTests(TaskTestCase):
+    def test_mark_complete_only_touches_given_ids(self):
+        done, other = self.make_task("first task"), self.make_task("second task")
+        self.assertEqual(Task.objects.mark_complete([done.id]), 1)
+        done.refresh_from_db()
+        other.refresh_from_db()
+        self.assertTrue(done.completed)
+        self.assertFalse(other.completed)
+        # update() skips auto_now, mark_complete sets it itself
+        self.assertGreater(done.updated_at, other.updated_at)
+
+    def test_mark_incomplete(self):
+        task = self.make_task("first task", completed=True)
+        self.assertEqual(Task.objects.mark_incomplete([task.id]), 1)
+        task.refresh_from_db()
+        self.assertFalse(task.completed)
+
+    def test_no_ids_no_query(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(Task.objects.mark_complete([]), 0)
+            self.assertEqual(Task.objects.mark_incomplete(iter(())), 0)
+
+
+class BulkCreateValidatedTests(TaskTestCase):
+    def new_task(self, description, **kwargs):
+        return Task(user=self.user, title=description[:20], description=description, **kwargs)
+
+    def test_creates_with_hashes(self):
+        created = Task.objects.bulk_create_validated([self.new_task("first task"), self.new_task("second task")])
+        self.assertEqual(len(created), 2)
+        self.assertEqual(
+            set(Task.objects.values_list("description_hash", flat=True)),
+            {task.description_hash for task in created},
+        )
+
+    def test_rejects_duplicates_in_batch_and_in_table(self):
+        self.make_task("already stored")
+        tasks = [self.new_task("fresh task"), self.new_task("already stored"),
+                 self.new_task("twice over"), self.new_task("twice over")]
+        with self.assertRaises(ValidationError) as ctx:
+            Task.objects.bulk_create_validated(tasks)
+        self.assertEqual(
+            [message.split(":")[0] for message in ctx.exception.messages],
+            ["task #1", "task #2", "task #3"],
+        )
+        # nothing of the batch was written
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_runs_clean(self):
+        with self.assertRaises(ValidationError) as ctx:
+            Task.objects.bulk_create_validated([self.new_task("tiny")])
+        self.assertIn("at least 5 characters", ctx.exception.messages[0])
+        self.assertFalse(Task.objects.exists())
+
+
+class TenantCacheBumpTests(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        tenant_cache.clear_local()
+        self.schema_name = connection.schema_name
+
+    def assertBumpedOnCommit(self, change):
+        tenant_cache.set("stats", "cached")
+        generation = tenant_cache.generation(self.schema_name)
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+            # not before the commit: a concurrent read would cache stale rows
+            self.assertEqual(tenant_cache.generation(self.schema_name), generation)
+        self.assertNotEqual(tenant_cache.generation(self.schema_name), generation)
+        self.assertIsNone(tenant_cache.get("stats"))
+
+    def test_save(self):
+        self.assertBumpedOnCommit(lambda: self.make_task("first task"))
+
+    def test_delete(self):
+        task = self.make_task("first task")
+        self.assertBumpedOnCommit(task.delete)
+
+    def test_queryset_update(self):
+        task = self.make_task("first task")
+        self.assertBumpedOnCommit(lambda: Task.objects.mark_complete([task.id]))
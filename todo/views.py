@@ -1,35 +1,316 @@
 # tasks/views.py
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_POST
 from django.shortcuts import get_object_or_404
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from tenant_users.permissions.models import UserTenantPermissions
+from tenant.cache import cache_tenant_response
+from tenant.instrumentation import measure
+from users.permissions import tenant_permissions
+from .conditional import conditional, task_collection_version, task_row_version
 from .models import Task
+from .pagination import (
+    akeyset_page,
+    astream_json_array,
+    keyset_page,
+    parse_page_size,
+    stream_json_array,
+)
+from .search import rank_page, search_tasks
+from .serializers import serialize_row, task_rows
+from .stats import user_task_stats
+
+
+BOOLEAN_PARAMS = {"1": True, "true": True, "0": False, "false": False}
+MAX_BULK_SIZE = 10000
+
+
+def filter_tasks(queryset, params):
+    '''
+        ?user=<id>            -> tasks of one user (Task.user, related_name='tasks')
+        ?completed=true|false
+        ?overdue=true|false   -> same rule as Task.is_overdue
+    '''
+    if params.get("user"):
+        try:
+            queryset = queryset.filter(user_id=int(params["user"]))
+        except ValueError:
+            raise ValueError("user must be an integer id")
+
+    for name in ("completed", "overdue"):
+        value = params.get(name)
+        if value in (None, ""):
+            continue
+        if value.lower() not in BOOLEAN_PARAMS:
+            raise ValueError(f"{name} must be true or false")
+        flag = BOOLEAN_PARAMS[value.lower()]
+        if name == "completed":
+            queryset = queryset.filter(completed=flag)
+        elif flag:
+            queryset = queryset.filter(published_at__isnull=False, completed=False)
+        else:
+            queryset = queryset.exclude(published_at__isnull=False, completed=False)
+    return queryset
+
 
 # List all tasks (public)
+@cache_tenant_response(key_prefix="todo:task-list")
+@conditional(task_collection_version)
 def task_list(request):
-    tasks = Task.objects.all()  # you could filter for published tasks only
-    data = [
-        {
-            "id": t.id,
-            "title": t.title,
-            "description": t.description,
-            "completed": t.completed,
-            "published_at": t.published_at,
-            "summary": t.summary,
-            "is_overdue": t.is_overdue
-        } for t in tasks
-    ]
-    return JsonResponse(data, safe=False)
+    '''
+        ?cursor=<next_cursor>&limit=<n>  -> one keyset page
+        ?stream=1                        -> every task, streamed as a JSON array
+        plus the filters of filter_tasks()
+    '''
+    try:
+        tasks = task_rows(filter_tasks(Task.objects.all(), request.GET))
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    if request.GET.get("stream") in ("1", "true"):
+        return StreamingHttpResponse(
+            stream_json_array(tasks, serialize_row),
+            content_type="application/json",
+        )
+
+    try:
+        limit = parse_page_size(request.GET.get("limit"))
+        rows, next_cursor = keyset_page(tasks, request.GET.get("cursor"), limit)
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    with measure(request, "serialization"):
+        return JsonResponse({
+            "results": [serialize_row(row) for row in rows],
+            "next_cursor": next_cursor,
+        })
 
 
 # Detail of one task
+@cache_tenant_response(key_prefix="todo:task-detail")
+@conditional(task_row_version)
 def task_detail(request, pk):
-    task = get_object_or_404(Task, pk=pk)
-    data = {
-        "id": task.id,
-        "title": task.title,
-        "description": task.description,
-        "completed": task.completed,
-        "published_at": task.published_at,
-        "summary": task.summary,
-        "is_overdue": task.is_overdue
-    }
-    return JsonResponse(data)
+    row = get_object_or_404(task_rows(), pk=pk)
+    with measure(request, "serialization"):
+        return JsonResponse(serialize_row(row))
+
+
+# Full-text search over title + description, best match first
+@cache_tenant_response(key_prefix="todo:task-search")
+def task_search(request):
+    '''
+        ?q=<websearch query>&cursor=<next_cursor>&limit=<n>
+        plus the filters of filter_tasks()
+    '''
+    try:
+        matches = search_tasks(filter_tasks(Task.objects.all(), request.GET), request.GET.get("q"))
+        limit = parse_page_size(request.GET.get("limit"))
+        rows, next_cursor = rank_page(
+            task_rows(matches, extra=("rank",)),
+            request.GET.get("cursor"),
+            limit,
+        )
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    with measure(request, "serialization"):
+        return JsonResponse({
+            "results": [{**serialize_row(row), "rank": row["rank"]} for row in rows],
+            "next_cursor": next_cursor,
+        })
+
+
+# Per-user completed / open / overdue counts for the whole tenant
+def task_user_stats(request):
+    # lists every member's email: tenant staff or todo.view_task only
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "authentication required"}, status=401)
+    if not (tenant_permissions(request.user).is_staff or request.user.has_perm("todo.view_task")):
+        return JsonResponse({"error": "permission denied"}, status=403)
+    return JsonResponse({"users": user_task_stats()})
+
+
+# Bulk complete / incomplete / create
+@require_POST
+def task_bulk(request):
+    '''
+        {"action": "complete" | "incomplete", "ids": [1, 2, ...]}
+        {"action": "create", "tasks": [{"title", "description", ...}, ...]}
+    '''
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "authentication required"}, status=401)
+    perms = tenant_permissions(request.user)
+    if not perms.is_member:
+        return JsonResponse({"error": "not a member of this tenant"}, status=403)
+    try:
+        payload = json.loads(request.body)
+        action = payload["action"]
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({"error": "expected a JSON body with an action"}, status=400)
+
+    items = payload.get("tasks" if action == "create" else "ids")
+    if not isinstance(items, list):
+        return JsonResponse({"error": "tasks/ids must be a list"}, status=400)
+    if len(items) > MAX_BULK_SIZE:
+        return JsonResponse({"error": f"at most {MAX_BULK_SIZE} items per request"}, status=400)
+
+    if action in ("complete", "incomplete"):
+        if not request.user.has_perm("todo.change_task"):
+            return JsonResponse({"error": "permission denied"}, status=403)
+        try:
+            ids = [int(pk) for pk in items]
+        except (TypeError, ValueError):
+            return JsonResponse({"error": "ids must be integers"}, status=400)
+        # ids the caller may not edit are skipped, not reported
+        editable = editable_tasks(request.user, perms)
+        if action == "complete":
+            updated = editable.mark_complete(ids)
+        else:
+            updated = editable.mark_incomplete(ids)
+        return JsonResponse({"updated": updated})
+
+    if action == "create":
+        if not request.user.has_perm("todo.add_task"):
+            return JsonResponse({"error": "permission denied"}, status=403)
+        try:
+            tasks = [task_from_payload(item, request.user) for item in items]
+            check_task_users(tasks, request.user, perms)
+            with transaction.atomic():
+                created = Task.objects.bulk_create_validated(tasks)
+        except ValidationError as exc:
+            return JsonResponse({"error": exc.messages}, status=400)
+        return JsonResponse({"created": len(created), "ids": [t.id for t in created]}, status=201)
+
+    return JsonResponse({"error": f"unknown action: {action}"}, status=400)
+
+
+def manages_tasks(perms):
+    # tenant staff act on everyone's tasks, other members only on their own
+    return perms.is_staff or perms.is_superuser
+
+
+def editable_tasks(user, perms):
+    tasks = Task.objects.all()
+    if not manages_tasks(perms):
+        tasks = tasks.filter(user_id=user.pk)
+    return tasks
+
+
+def check_task_users(tasks, user, perms):
+    user_ids = {task.user_id for task in tasks}
+    if not manages_tasks(perms) and user_ids - {user.pk}:
+        raise ValidationError({"user": "you can only create tasks for yourself"})
+    # bulk_create_validated skips the per-row FK check, do it in one query;
+    # the owners must also be members of this tenant, not just any user
+    members = set(
+        UserTenantPermissions.objects
+        .filter(profile_id__in=user_ids)
+        .values_list("profile_id", flat=True)
+    )
+    unknown = sorted(user_ids - members)
+    if unknown:
+        raise ValidationError({"user": f"unknown user id(s): {unknown}"})
+
+
+def task_from_payload(item, default_user):
+    if not isinstance(item, dict):
+        raise ValidationError("each task must be an object")
+    published_at = item.get("published_at")
+    if published_at:
+        published_at = parse_datetime(published_at) if isinstance(published_at, str) else None
+        if published_at is None:
+            raise ValidationError({"published_at": "invalid datetime"})
+        if timezone.is_naive(published_at):
+            # no offset given: read it in the project's TIME_ZONE
+            published_at = timezone.make_aware(published_at)
+    task = Task(
+        title=item.get("title") or "",
+        description=item.get("description") or "",
+        completed=parse_completed(item.get("completed", False)),
+        published_at=published_at or None,
+    )
+    if item.get("user"):
+        try:
+            task.user_id = int(item["user"])
+        except (TypeError, ValueError):
+            raise ValidationError({"user": "user must be an integer id"})
+    else:
+        task.user = default_user
+    return task
+
+
+def parse_completed(value):
+    # bool("false") is True: accept JSON booleans and the query-string words only
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in BOOLEAN_PARAMS:
+        return BOOLEAN_PARAMS[value.lower()]
+    raise ValidationError({"completed": "completed must be true or false"})
+
+
+#----------async (ASGI) versions------------
+'''
+    mentality: same payloads as task_list / task_detail, but the view awaits
+    the ORM instead of holding a worker thread.
+    - under ASGI every request runs its sync code (middleware, ORM) on its own
+      thread-sensitive executor, so the connection TenantMainMiddleware set the
+      search_path on is the one aget()/aiterator() use, across every await.
+    - activate_request_tenant() re-binds request.tenant on that connection
+      anyway; set_tenant() is lazy, so this costs no query.
+'''
+async def activate_request_tenant(request):
+    tenant = getattr(request, "tenant", None)
+    if tenant is None:
+        return
+
+    # `connection` must be resolved inside the sync hop: it is per-thread
+    def bind():
+        connection.set_tenant(tenant)
+
+    await sync_to_async(bind)()
+
+
+@cache_tenant_response(key_prefix="todo:task-list")
+@conditional(task_collection_version)
+async def task_list_async(request):
+    await activate_request_tenant(request)
+    try:
+        tasks = task_rows(filter_tasks(Task.objects.all(), request.GET))
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    if request.GET.get("stream") in ("1", "true"):
+        return StreamingHttpResponse(
+            astream_json_array(tasks, serialize_row),
+            content_type="application/json",
+        )
+
+    try:
+        limit = parse_page_size(request.GET.get("limit"))
+        rows, next_cursor = await akeyset_page(tasks, request.GET.get("cursor"), limit)
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    with measure(request, "serialization"):
+        return JsonResponse({
+            "results": [serialize_row(row) for row in rows],
+            "next_cursor": next_cursor,
+        })
+
+
+@cache_tenant_response(key_prefix="todo:task-detail")
+@conditional(task_row_version)
+async def task_detail_async(request, pk):
+    await activate_request_tenant(request)
+    try:
+        row = await task_rows().aget(pk=pk)
+    except Task.DoesNotExist:
+        raise Http404("No Task matches the given query.")
+    with measure(request, "serialization"):
+        return JsonResponse(serialize_row(row))
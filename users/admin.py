@@ -1,3 +1,16 @@
 from django.contrib import admin
 
+from tenant.admin_mixins import EstimatedCountAdminMixin
+from users.models import CustomUser
 # Register your models here.
+
+
+@admin.register(CustomUser)
+class CustomUserAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    # -------- List View --------
+    list_display = ("email", "role", "is_active", "is_verified", "created_at")
+    list_filter = ("is_active", "role")
+    # prefix match on UPPER(email), see CustomUser.Meta.indexes
+    search_fields = ("^email",)
+    exclude = ("password", "tenants")
+    readonly_fields = ("last_login",)
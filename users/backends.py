@@ -0,0 +1,28 @@
+# users/backends.py
+from tenant_users.permissions.backend import UserBackend
+
+from users.permissions import tenant_permissions
+
+
+class CachedUserBackend(UserBackend):
+    """
+    tenant_users' UserBackend with the per-(tenant, user) permission cache of
+    users.permissions in front of get_all_permissions().
+
+    ``user_obj`` here is a UserTenantPermissions row (the tenant-side facade);
+    its profile is the CustomUser the cache is keyed on.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        # only use the cache when the profile is already loaded, fetching it
+        # here would cost the query we are trying to save
+        profile_field = user_obj._meta.get_field("profile")
+        if obj is not None or not profile_field.is_cached(user_obj):
+            return super().get_all_permissions(user_obj, obj)
+        if not user_obj.is_active:
+            return set()
+        return set(tenant_permissions(user_obj.profile).permissions)
+
+    def load_all_permissions(self, user_obj):
+        """The uncached permission set, used to fill the cache."""
+        return super().get_all_permissions(user_obj)
@@ -1,8 +1,12 @@
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from tenant_users.tenants.models import UserProfile
 
+from users.permissions import tenant_permissions
+
 class BaseModel(models.Model):
     created_at = models.DateTimeField(db_index=True, default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
@@ -84,6 +88,37 @@ class CustomUser(UserProfile, BaseModel):
     def role_display(self):
         return self.get_role_display() if self.role else None
 
+    # ------------------------------------------------------------------
+    # Permissions (current tenant)
+    # ------------------------------------------------------------------
+    # Served from users.permissions instead of tenant_perms, so a hot
+    # permission check is a cache lookup, not 2-3 queries. Object-level
+    # checks (obj is not None) still go through tenant_users.
+    def get_all_permissions(self, obj=None):
+        if obj is not None:
+            return super().get_all_permissions(obj)
+        if not self.is_active:
+            return set()
+        return set(tenant_permissions(self).permissions)
+
+    def has_perm(self, perm, obj=None):
+        if obj is not None:
+            return super().has_perm(perm, obj)
+        if not self.is_active:
+            return False
+        perms = tenant_permissions(self)
+        return perms.is_superuser or perm in perms.permissions
+
+    def has_perms(self, perm_list, obj=None):
+        return all(self.has_perm(perm, obj) for perm in perm_list)
+
+    def has_module_perms(self, app_label):
+        if not self.is_active:
+            return False
+        perms = tenant_permissions(self)
+        prefix = f"{app_label}."
+        return perms.is_superuser or any(p.startswith(prefix) for p in perms.permissions)
+
     # ------------------------------------------------------------------
     # State helpers
     # ------------------------------------------------------------------
@@ -120,6 +155,8 @@ class CustomUser(UserProfile, BaseModel):
         indexes = [
             models.Index(fields=["is_active"]),
             models.Index(fields=["role"]),
+            # admin search "^email" -> UPPER(email) LIKE 'X%'
+            models.Index(OpClass(Upper("email"), name="text_pattern_ops"), name="user_email_upper_idx"),
         ]
 
     def __str__(self):
@@ -0,0 +1,127 @@
+# users/permissions.py
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from tenant.resolver import LRUCache
+
+
+'''
+    mentality: tenant_users resolves a user's permissions in the current
+    tenant with several queries (UserTenantPermissions row, user perms,
+    group perms) on every request that checks one.
+    - cache the resolved set per (tenant schema, user) in a process-local LRU.
+    - entries are keyed by a per-schema version kept in the Django cache;
+      membership / group / permission changes bump it (users.signals) once
+      their transaction commits.
+    - the versions themselves are held locally for
+      TENANT_PERMISSION_VERSION_TTL seconds, so a check is dictionary
+      lookups; a bump in this process is seen at once, others see it within
+      that window.
+    - a version evicted from the shared cache restarts from the current time
+      in ms, never from a number cached entries may still carry.
+    - the user's updated_at is part of the key, so saving the user (role,
+      is_active, ...) also drops its entry.
+'''
+TenantPermissions = namedtuple(
+    "TenantPermissions",
+    ["is_member", "is_staff", "is_superuser", "permissions"],
+)
+
+NO_PERMISSIONS = TenantPermissions(False, False, False, frozenset())
+
+permission_cache = LRUCache(
+    maxsize=getattr(settings, "TENANT_PERMISSION_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "TENANT_PERMISSION_CACHE_TTL", 300),
+)
+
+version_cache = LRUCache(
+    maxsize=getattr(settings, "TENANT_PERMISSION_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "TENANT_PERMISSION_VERSION_TTL", 1),
+)
+
+GLOBAL_SCOPE = "*"
+
+
+def _version_key(schema_name):
+    return f"tenant-perms-version:{schema_name}"
+
+
+def _fresh_version():
+    return int(time.time() * 1000)
+
+
+def _shared_version(schema_name):
+    key = _version_key(schema_name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _fresh_version(), timeout=None)
+        version = cache.get(key, 0)
+    return version
+
+
+def _local_version(schema_name):
+    version = version_cache.get(schema_name)
+    if version is None:
+        version = _shared_version(schema_name)
+        version_cache.set(schema_name, version)
+    return version
+
+
+def permissions_version(schema_name):
+    return _local_version(schema_name), _local_version(GLOBAL_SCOPE)
+
+
+def bump_permissions_version(schema_name=None):
+    """Invalidate every cached permission set of one schema (None = all)."""
+    scope = schema_name or GLOBAL_SCOPE
+    key = _version_key(scope)
+    try:
+        version = cache.incr(key)
+    except ValueError:
+        # evicted: don't restart from a number that was already handed out
+        version = _fresh_version()
+        cache.set(key, version, timeout=None)
+    version_cache.set(scope, version)
+    return version
+
+
+def bump_permissions_version_on_commit(schema_name=None):
+    """bump_permissions_version() once the current transaction commits."""
+    transaction.on_commit(lambda: bump_permissions_version(schema_name))
+
+
+def tenant_permissions(user):
+    """Cached TenantPermissions of ``user`` in the current tenant schema."""
+    schema_name = connection.schema_name
+    key = (
+        schema_name,
+        user.pk,
+        user.updated_at,
+        permissions_version(schema_name),
+    )
+    entry = permission_cache.get(key)
+    if entry is None:
+        entry = load_tenant_permissions(user)
+        permission_cache.set(key, entry)
+    return entry
+
+
+def load_tenant_permissions(user):
+    from tenant_users.permissions.models import UserTenantPermissions
+    from users.backends import CachedUserBackend
+
+    try:
+        perms = UserTenantPermissions.objects.get(profile_id=user.pk)
+    except UserTenantPermissions.DoesNotExist:
+        return NO_PERMISSIONS
+
+    return TenantPermissions(
+        is_member=True,
+        is_staff=perms.is_staff,
+        is_superuser=perms.is_superuser,
+        permissions=frozenset(CachedUserBackend().load_all_permissions(perms)),
+    )
@@ -0,0 +1,73 @@
+# users/signals.py
+from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from tenant_users.permissions.models import UserTenantPermissions
+
+from tenant.models import Tenant
+from users.models import CustomUser
+from tenant.usage import release_members, reserve_members
+from users.permissions import bump_permissions_version_on_commit
+
+
+# Bumps run on commit: bumping inside the transaction would let a concurrent
+# request cache the pre-commit grants under the new version.
+
+# per-tenant grants: these rows live in the tenant schema being changed
+@receiver([post_save, post_delete], sender=UserTenantPermissions)
+@receiver([post_delete], sender=Group)
+@receiver([post_delete], sender=Permission)
+def tenant_permissions_changed(sender, **kwargs):
+    bump_permissions_version_on_commit(connection.schema_name)
+
+
+@receiver(m2m_changed, sender=UserTenantPermissions.groups.through)
+@receiver(m2m_changed, sender=UserTenantPermissions.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def tenant_grants_changed(sender, action, **kwargs):
+    if action.startswith("post_"):
+        bump_permissions_version_on_commit(connection.schema_name)
+
+
+# membership: CustomUser.tenants is stored in the public schema
+@receiver(m2m_changed, sender=CustomUser.tenants.through)
+def membership_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if isinstance(instance, Tenant):
+        bump_permissions_version_on_commit(instance.schema_name)
+    elif pk_set:
+        for schema_name in Tenant.objects.filter(pk__in=pk_set).values_list("schema_name", flat=True):
+            bump_permissions_version_on_commit(schema_name)
+    else:
+        # post_clear doesn't say which tenants were involved
+        bump_permissions_version_on_commit()
+
+
+# membership counters (tenant.usage): the quota check runs in pre_add, inside
+# the add's transaction, so a refused or failed add leaves no increment behind
+@receiver(m2m_changed, sender=CustomUser.tenants.through)
+def count_members(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_add" and pk_set:
+        # pk_set holds only the memberships that are actually new
+        if isinstance(instance, Tenant):
+            reserve_members(instance, len(pk_set))
+        else:
+            for tenant in Tenant.objects.filter(pk__in=pk_set):
+                reserve_members(tenant)
+    elif action in ("pre_remove", "pre_clear"):
+        # remove() reports the ids it was given, count the real memberships
+        memberships = sender.objects.all()
+        if isinstance(instance, Tenant):
+            memberships = memberships.filter(tenant_id=instance.pk)
+            if action == "pre_remove":
+                memberships = memberships.filter(customuser_id__in=pk_set or ())
+            instance._released_members = {instance.pk: memberships.count()}
+        else:
+            memberships = memberships.filter(customuser_id=instance.pk)
+            if action == "pre_remove":
+                memberships = memberships.filter(tenant_id__in=pk_set or ())
+            instance._released_members = {pk: 1 for pk in memberships.values_list("tenant_id", flat=True)}
+    elif action in ("post_remove", "post_clear"):
+        release_members(instance.__dict__.pop("_released_members", {}))
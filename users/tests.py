@@ -0,0 +1,65 @@
+from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django_tenants.test.cases import TenantTestCase
+from tenant_users.permissions.models import UserTenantPermissions
+
+from .models import CustomUser
+from .permissions import (
+    NO_PERMISSIONS,
+    bump_permissions_version,
+    permission_cache,
+    permissions_version,
+    tenant_permissions,
+    version_cache,
+)
+
+
+#----------database tests (tenant schema)------------
+class PermissionCacheTests(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = "Test tenant"
+        tenant.slug = "test"
+
+    def setUp(self):
+        permission_cache.clear()
+        version_cache.clear()
+        self.user = CustomUser.objects.create(email="member@example.com")
+        self.perms = UserTenantPermissions.objects.create(profile=self.user)
+        self.permission = Permission.objects.get(codename="add_task", content_type__app_label="todo")
+
+    def assertDroppedOnCommit(self, change):
+        before = tenant_permissions(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+            # bumped only after the commit
+            self.assertIs(tenant_permissions(self.user), before)
+        self.assertIsNot(tenant_permissions(self.user), before)
+        return tenant_permissions(self.user)
+
+    def test_entry_is_cached(self):
+        first = tenant_permissions(self.user)
+        with self.assertNumQueries(0):
+            self.assertIs(tenant_permissions(self.user), first)
+        self.assertTrue(first.is_member)
+        self.assertEqual(first.permissions, frozenset())
+
+    def test_user_permission_granted(self):
+        entry = self.assertDroppedOnCommit(lambda: self.perms.user_permissions.add(self.permission))
+        self.assertEqual(entry.permissions, {"todo.add_task"})
+
+    def test_group_permission_granted(self):
+        group = Group.objects.create(name="editors")
+        self.perms.groups.add(group)
+        entry = self.assertDroppedOnCommit(lambda: group.permissions.add(self.permission))
+        self.assertEqual(entry.permissions, {"todo.add_task"})
+
+    def test_membership_row_deleted(self):
+        self.assertEqual(self.assertDroppedOnCommit(self.perms.delete), NO_PERMISSIONS)
+
+    def test_global_bump(self):
+        schema_name = connection.schema_name
+        before = permissions_version(schema_name)
+        bump_permissions_version()
+        self.assertEqual(permissions_version(schema_name)[0], before[0])
+        self.assertNotEqual(permissions_version(schema_name)[1], before[1])